@@ -7,15 +7,16 @@ from kubernetes import client, config
 from k8s_deploy_handler import deploy_to_namespace
 from kubernetes.client.exceptions import ApiException
 from config import Config
+from k8s_async import run_k8s, cluster_api_client
 from k8s_resource_api import resource_api
 from k8s_service_actions import service_actions
 from logs_api import logs_api 
+from fleet_api import fleet_api
 from  delete_namespace_route import delete_environment
 from github_oauth import github_bp
+from embedding_utils import warm_up_in_background
 
 
-os.environ["TOKENIZERS_PARALLELISM"] = "false"
-
 app = Quart(__name__)
 app = cors(app, allow_origin="http://localhost:3000", allow_credentials=True)
 
@@ -26,6 +27,12 @@ app.register_blueprint(service_actions)
 app.register_blueprint(delete_environment)
 
 app.register_blueprint(logs_api)
+app.register_blueprint(fleet_api)
+
+@app.before_serving
+async def warm_embedding_model():
+    # Load the classifier model off the request path; topology falls back to name rules until it is ready
+    warm_up_in_background()
 
 # Database connections
 def get_cluster_db():
@@ -68,8 +75,9 @@ async def connect_via_kubeconfig(env_name):
     await kube_file.save(kube_path)
 
     try:
-        config.load_kube_config(kube_path)
-        contexts, active_context = config.list_kube_config_contexts()
+        # Validates the upload without installing it as the process-wide default config
+        await run_k8s(config.load_kube_config, kube_path, client_configuration=client.Configuration())
+        contexts, active_context = await run_k8s(config.list_kube_config_contexts)
         cluster_name = active_context["context"]["cluster"]
 
         namespace_created = await create_namespace(env_name)
@@ -99,11 +107,10 @@ async def connect_via_token(env_name, cluster_url):
     kube_config.host = cluster_url
     kube_config.verify_ssl = False
     kube_config.api_key = {"authorization": f"Bearer {token}"}
-    client.Configuration.set_default(kube_config)
 
     try:
-        v1 = client.CoreV1Api()
-        v1.list_namespace()
+        v1 = client.CoreV1Api(client.ApiClient(kube_config))
+        await run_k8s(v1.list_namespace, limit=1)
 
         cluster_name = cluster_url.split("/")[-1]
         namespace_created = await create_namespace(env_name)
@@ -121,16 +128,13 @@ async def connect_via_token(env_name, cluster_url):
 
 async def create_namespace(env_name):
     try:
-        try:
-            config.load_incluster_config()
-        except:
-            config.load_kube_config()
+        api_client = await cluster_api_client()
 
-        v1 = client.CoreV1Api()
+        v1 = client.CoreV1Api(api_client)
         namespace_metadata = client.V1ObjectMeta(name=env_name)
         namespace_body = client.V1Namespace(metadata=namespace_metadata)
 
-        v1.create_namespace(body=namespace_body)
+        await run_k8s(v1.create_namespace, body=namespace_body)
         print(f"✅ Namespace '{env_name}' created successfully.")
         return True
     except ApiException as e:
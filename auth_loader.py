@@ -4,6 +4,7 @@ import os
 from kubernetes import config, client
 import asyncpg
 from config import Config
+from k8s_async import run_k8s
 
 async def get_cluster_auth(env_name):
     conn = await asyncpg.connect(**Config.CLUSTER_DB_CONFIG)
@@ -14,7 +15,12 @@ async def get_cluster_auth(env_name):
     await conn.close()
     return row
 
+def read_token(token_path):
+    with open(token_path, "r") as f:
+        return f.read().strip()
+
 async def load_k8s_auth(env_name):
+    """ApiClient authenticated for the environment's cluster; the process-wide default config is left alone."""
     row = await get_cluster_auth(env_name)
     if not row:
         raise Exception("Cluster auth not found for this environment")
@@ -24,19 +30,20 @@ async def load_k8s_auth(env_name):
 
     if auth_method == "kubeconfig":
         kubeconfig_path = os.path.join(Config.UPLOAD_FOLDER, "uploaded_kubeconfig.yaml")
-        config.load_kube_config(config_file=kubeconfig_path)
+        kube_config = client.Configuration()
+        await run_k8s(config.load_kube_config, config_file=kubeconfig_path, client_configuration=kube_config)
     elif auth_method == "token":
         token_path = os.path.join(Config.UPLOAD_FOLDER, f"{env_name}_token.txt")
         if not os.path.exists(token_path):
             raise Exception("Token file not found")
 
-        with open(token_path, "r") as f:
-            token = f.read().strip()
+        token = await run_k8s(read_token, token_path)
 
         kube_config = client.Configuration()
         kube_config.host = cluster_url
         kube_config.verify_ssl = False
         kube_config.api_key = {"authorization": f"Bearer {token}"}
-        client.Configuration.set_default(kube_config)
     else:
-        raise Exception(f"Unsupported auth method: {auth_method}")
\ No newline at end of file
+        raise Exception(f"Unsupported auth method: {auth_method}")
+
+    return client.ApiClient(kube_config)
\ No newline at end of file
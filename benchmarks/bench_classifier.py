@@ -0,0 +1,153 @@
+# benchmarks/bench_classifier.py
+
+"""
+Accuracy and speed of the service-type classifiers on labelled corpora:
+
+    name-rules   guess_type_from_name, the fallback while the model loads
+    cascade      ai_infer_service_types, exactly as the topology calls it:
+                 port/image/name tiers, then the model (through the
+                 classifier worker) or the name fallback for the rest
+    embedding    the embedding model alone (classify_texts, uncached)
+
+Two splits are reported. `tuning` (service_type_corpus.json) is the data
+the rule tables in service_classifier.py were written against, so rule
+accuracy on it is optimistic; `held-out` (service_type_holdout.json) was
+written separately and must not be used to tune the rules. Rows may carry
+`ports` and `kind` ("Pod" rows are reduced to their base name, as the
+topology does).
+
+For each: overall and per-class accuracy (recall within each VALID_TYPES
+class), a confusion matrix (rows = label, columns = prediction),
+single-item and batch throughput. Cascade timings include the classifier
+worker's micro-batch wait and run against an empty classification cache.
+Model load time (encoder plus example matrix) is reported once.
+
+Runs offline by default: the model must already be in the local Hugging
+Face cache (point --cache-dir at it if it is not the default). Without a
+usable model the rule-based classifiers are still reported.
+
+    python -m benchmarks.bench_classifier
+    python -m benchmarks.bench_classifier --corpus my_corpus.json --online
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from pathlib import Path
+
+from benchmarks.bench_embedding_backends import CORPUS_PATH, corpus_names, corpus_texts, load_corpus
+
+HOLDOUT_PATH = Path(__file__).with_name("service_type_holdout.json")
+
+
+async def timed(fn):
+    start = time.perf_counter()
+    result = await fn()
+    return result, time.perf_counter() - start
+
+
+async def throughput(classify_batch, items, repeat):
+    """(single-item items/s from the median latency, batch items/s from the best whole-corpus run)."""
+    single = statistics.median([(await timed(lambda: classify_batch([item])))[1] for item in items])
+    batch = min([(await timed(lambda: classify_batch(items)))[1] for _ in range(repeat)])
+    return 1 / single if single else float("inf"), len(items) / batch if batch else float("inf")
+
+
+def report(label, predictions, labels, classes, speed):
+    print(f"\n== {label}")
+    correct = sum(p == t for p, t in zip(predictions, labels))
+    print(f"accuracy {correct}/{len(labels)} = {correct / len(labels):.1%}")
+
+    for cls in classes:
+        rows = [p for p, t in zip(predictions, labels) if t == cls]
+        if rows:
+            hits = sum(p == cls for p in rows)
+            print(f"  {cls:<9} {hits:>3}/{len(rows):<3} {hits / len(rows):6.1%}")
+
+    columns = classes + sorted({p for p in predictions if p not in classes})
+    print("\n  " + " " * 9 + "".join(f"{c[:8]:>9}" for c in columns))
+    for cls in classes:
+        counts = [sum(1 for p, t in zip(predictions, labels) if t == cls and p == c) for c in columns]
+        print(f"  {cls:<9}" + "".join(f"{n:>9}" for n in counts))
+
+    single, batch = speed
+    print(f"\nthroughput: {single:,.0f} items/s single, {batch:,.0f} items/s batch")
+
+
+async def evaluate(split, path, model, repeat):
+    import embedding_utils
+    from classification_cache import ClassificationCache
+    from k8s_resource_api import ai_infer_service_types, guess_type_from_name
+
+    corpus = load_corpus(path)
+    labels = [row["type"] for row in corpus]
+    names = corpus_names(corpus)
+    texts = corpus_texts(corpus)
+    items = list(range(len(corpus)))
+    classes = list(embedding_utils.VALID_TYPES)
+
+    async def name_rules(batch):
+        return [guess_type_from_name(names[i]) for i in batch]
+
+    async def cascade(batch):
+        # Fresh cache per call, so repeats measure inference rather than cache hits
+        embedding_utils.classification_cache = ClassificationCache(path="")
+        return await ai_infer_service_types([(names[i], corpus[i].get("ports"), corpus[i]["image"]) for i in batch])
+
+    async def embedding(batch):
+        return embedding_utils.classify_texts([texts[i] for i in batch])
+
+    classifiers = [("name-rules", name_rules), ("cascade" if model else "cascade (name fallback for the rest)", cascade)]
+    if model:
+        classifiers.append(("embedding", embedding))
+
+    print(f"\n######## {split}: {len(corpus)} labelled items from {path}")
+    for label, classify in classifiers:
+        await classify(items[:4])  # warm-up
+        report(f"{label} [{split}]", await classify(items), labels, classes, await throughput(classify, items, repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="evaluate this corpus instead of the tuning and held-out splits")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backend", help="embedding backend (default: EMBEDDING_BACKEND)")
+    parser.add_argument("--cache-dir", help="Hugging Face cache holding the model (sets HF_HOME)")
+    parser.add_argument("--online", action="store_true", help="allow downloading the model")
+    args = parser.parse_args()
+
+    if args.backend:
+        os.environ["EMBEDDING_BACKEND"] = args.backend
+    if args.cache_dir:
+        os.environ["HF_HOME"] = args.cache_dir
+    if not args.online:
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+    import embedding_utils
+
+    try:
+        start = time.perf_counter()
+        embedding_utils.load_model()
+        model = True
+        print(f"model {embedding_utils.MODEL_ID} loaded in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        model = False
+        print(f"model unavailable ({e}); reporting rule-based classifiers only")
+        # The cascade would otherwise retry the load in the background on its first call
+        import k8s_resource_api
+        k8s_resource_api.warm_up_in_background = lambda: None
+
+    splits = [("custom", args.corpus)] if args.corpus else [("tuning", CORPUS_PATH), ("held-out", HOLDOUT_PATH)]
+
+    async def run():
+        for split, path in splits:
+            await evaluate(split, path, model, args.repeat)
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# benchmarks/bench_embedding_backends.py
+
+"""
+Compares the service classifier's embedding backends (embedding_backends.py)
+on CPU. Each backend is measured in its own subprocess so model load time
+and RSS are not polluted by the others. Reported per backend:
+
+    load      model load + example encoding, seconds
+    rss       peak resident set size of the process, MB
+    single    median latency of one-item classification, ms
+    batch     best latency of classifying the whole corpus in one call, ms
+    examples  agreement with the first backend on the TYPE_EXAMPLES names
+    corpus    agreement with the first backend on the labelled corpus
+    accuracy  corpus accuracy against its labels
+
+Classification bypasses the classification cache. The corpus is
+benchmarks/service_type_corpus.json; names and images are normalized the
+same way the app does it.
+
+    python -m benchmarks.bench_embedding_backends --backends torch onnx onnx-int8
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+CORPUS_PATH = Path(__file__).with_name("service_type_corpus.json")
+
+
+def load_corpus(path=CORPUS_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def corpus_names(corpus):
+    """Names as the topology classifies them: generated suffixes stripped from rows of kind Pod."""
+    from classification_cache import pod_base_name
+
+    return [pod_base_name(row["name"]) if row.get("kind") == "Pod" else row["name"] for row in corpus]
+
+
+def corpus_texts(corpus):
+    from classification_cache import classification_identity
+    from embedding_utils import classification_text
+
+    return [
+        classification_text(*classification_identity(name, row["image"]))
+        for name, row in zip(corpus_names(corpus), corpus)
+    ]
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def measure(backend, repeat):
+    """Runs inside the per-backend subprocess; returns a JSON-serializable result."""
+    os.environ["EMBEDDING_BACKEND"] = backend
+    import embedding_utils
+
+    start = time.perf_counter()
+    embedding_utils.load_model()
+    load_seconds = time.perf_counter() - start
+
+    corpus = load_corpus()
+    texts = corpus_texts(corpus)
+    example_names = [name for _, name in embedding_utils.example_texts]
+    classify = embedding_utils.classify_texts
+
+    classify(texts[:8])  # warm-up
+    single = statistics.median(_timed(lambda: classify([text])) for text in texts)
+    batch = min(_timed(lambda: classify(texts)) for _ in range(repeat))
+
+    return {
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "rss_mb": peak_rss_mb(),
+        "single_ms": single * 1000,
+        "batch_ms": batch * 1000,
+        "example_predictions": classify(example_names),
+        "corpus_predictions": classify(texts),
+    }
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def agreement(a, b):
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def run_backend(backend, repeat):
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_embedding_backends", "--measure", backend, "--repeat", str(repeat)],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        print(f"  {backend}: failed\n{result.stderr.strip()}")
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.repeat)))
+        return
+
+    labels = [row["type"] for row in load_corpus()]
+    results = [r for r in (run_backend(backend, args.repeat) for backend in args.backends) if r]
+    if not results:
+        return
+    baseline = results[0]
+
+    print(f"\n{len(labels)} corpus items; agreement is against '{baseline['backend']}'")
+    print(f"{'backend':<10} {'load s':>7} {'rss MB':>8} {'single ms':>10} {'batch ms':>9} {'examples':>9} {'corpus':>7} {'accuracy':>9}")
+    for r in results:
+        print(f"{r['backend']:<10} {r['load_seconds']:>7.2f} {r['rss_mb']:>8.0f} {r['single_ms']:>10.2f} {r['batch_ms']:>9.1f}"
+              f" {agreement(r['example_predictions'], baseline['example_predictions']):>9.1%}"
+              f" {agreement(r['corpus_predictions'], baseline['corpus_predictions']):>7.1%}"
+              f" {agreement(r['corpus_predictions'], labels):>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
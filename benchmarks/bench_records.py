@@ -0,0 +1,134 @@
+# benchmarks/bench_records.py
+
+"""
+Compares the two ways of listing pods: the kubernetes client's default
+V1PodList deserialization versus the raw `_preload_content=False` path
+parsed into k8s_records.PodRecord. No cluster is needed; the HTTP layer is
+replaced with a canned PodList response.
+
+    python -m benchmarks.bench_records --pods 1000 5000
+"""
+
+import argparse
+import gc
+import io
+import json
+import time
+import tracemalloc
+
+import urllib3
+from kubernetes import client
+
+from k8s_records import list_records
+
+
+def synthetic_pod(i):
+    app = f"app-{i % 50}"
+    return {
+        "metadata": {
+            "name": f"{app}-7d9f8c6b5-{i:05d}",
+            "namespace": "bench",
+            "uid": f"00000000-0000-0000-0000-{i:012d}",
+            "resourceVersion": str(100000 + i),
+            "creationTimestamp": "2025-01-01T00:00:00Z",
+            "labels": {"app": app, "pod-template-hash": "7d9f8c6b5", "tier": "backend"},
+            "annotations": {"kubectl.kubernetes.io/restartedAt": "2025-01-01T00:00:00Z", "prometheus.io/scrape": "true"},
+            "ownerReferences": [{"apiVersion": "apps/v1", "kind": "ReplicaSet", "name": f"{app}-7d9f8c6b5",
+                                 "uid": f"rs-{i % 50}", "controller": True, "blockOwnerDeletion": True}],
+            "managedFields": [{"manager": "kube-controller-manager", "operation": "Update", "apiVersion": "v1",
+                               "time": "2025-01-01T00:00:00Z", "fieldsType": "FieldsV1",
+                               "fieldsV1": {"f:metadata": {"f:labels": {".": {}, "f:app": {}}}}}],
+        },
+        "spec": {
+            "containers": [{
+                "name": app,
+                "image": f"gcr.io/example/{app}:1.{i % 7}.0",
+                "ports": [{"containerPort": 8080, "protocol": "TCP"}],
+                "env": [{"name": f"VAR_{n}", "value": str(n)} for n in range(10)],
+                "resources": {"limits": {"cpu": "500m", "memory": "256Mi"}, "requests": {"cpu": "100m", "memory": "128Mi"}},
+                "readinessProbe": {"httpGet": {"path": "/healthz", "port": 8080}, "periodSeconds": 10},
+                "volumeMounts": [{"name": "data", "mountPath": "/data"}],
+            }],
+            "volumes": [{"name": "data", "persistentVolumeClaim": {"claimName": f"{app}-data"}},
+                        {"name": "token", "projected": {"sources": [{"serviceAccountToken": {"path": "token"}}]}}],
+            "nodeName": f"node-{i % 20}",
+            "serviceAccountName": "default",
+        },
+        "status": {
+            "phase": "Running",
+            "podIP": f"10.0.{i // 250}.{i % 250}",
+            "startTime": "2025-01-01T00:00:00Z",
+            "conditions": [{"type": t, "status": "True", "lastTransitionTime": "2025-01-01T00:00:00Z"}
+                           for t in ("Initialized", "Ready", "ContainersReady", "PodScheduled")],
+            "containerStatuses": [{"name": app, "ready": True, "restartCount": 0, "image": f"gcr.io/example/{app}:1.{i % 7}.0",
+                                   "imageID": "sha256:" + "0" * 64, "state": {"running": {"startedAt": "2025-01-01T00:00:00Z"}}}],
+        },
+    }
+
+
+class CannedPool:
+    """Stands in for urllib3's pool manager and always answers with the same body."""
+
+    def __init__(self, body):
+        self.body = body
+
+    def request(self, method, url, **kwargs):
+        return urllib3.HTTPResponse(
+            body=io.BytesIO(self.body),
+            status=200,
+            headers={"Content-Type": "application/json"},
+            preload_content=kwargs.get("preload_content", True),
+        )
+
+
+def timed(fn):
+    gc.collect()
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def peak_memory(fn):
+    # Separate pass: tracemalloc itself slows allocation-heavy code down a lot
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def run(pod_count, repeat):
+    body = json.dumps({"kind": "PodList", "apiVersion": "v1", "metadata": {"resourceVersion": "1"},
+                       "items": [synthetic_pod(i) for i in range(pod_count)]}).encode()
+    api_client = client.ApiClient(client.Configuration())
+    api_client.rest_client.pool_manager = CannedPool(body)
+    core_v1 = client.CoreV1Api(api_client)
+
+    paths = {
+        "V1Pod models": lambda: core_v1.list_namespaced_pod("bench").items,
+        "raw PodRecord": lambda: list_records("pods", core_v1.list_namespaced_pod, "bench")[0],
+    }
+    print(f"\n{pod_count} pods ({len(body) / 1e6:.1f} MB JSON), best of {repeat}")
+    for label, fn in paths.items():
+        best = None
+        for _ in range(repeat):
+            items, elapsed = timed(fn)
+            assert len(items) == pod_count
+            best = elapsed if best is None else min(best, elapsed)
+            del items
+        peak = peak_memory(fn)
+        print(f"  {label:<14} {best * 1000:9.1f} ms   peak {peak / 1e6:8.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pods", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    for pod_count in args.pods:
+        run(pod_count, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
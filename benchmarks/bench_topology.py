@@ -0,0 +1,160 @@
+# benchmarks/bench_topology.py
+
+"""
+Measures how GET /api/environment-resources scales with namespace size.
+Each scale point is a synthetic namespace served by a local fake
+kube-apiserver (benchmarks/fake_apiserver.py); the resource blueprint runs
+in-process behind Quart's test client. Reported per point:
+
+    cold     first request: informer list + topology build
+    warm     median of --repeat requests against the synced informer
+    ndjson   ?format=ndjson (paged lists, no informer): first line / whole body
+    lists    apiserver list calls made by cold / warm / ndjson requests
+    peak     peak traced memory of a cold request / an ndjson request (separate passes)
+
+The embedding classifier is stubbed by default so the numbers isolate the
+topology path; --classifier real loads the sentence-transformers model.
+
+    python -m benchmarks.bench_topology --services 10 100 1000
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+from benchmarks.fake_apiserver import FakeApiServer, synthetic_namespace
+
+
+def stub_classifier():
+    module = types.ModuleType("embedding_utils")
+    module.embed_classify = lambda name, image=None: "API"
+    module.embed_classify_batch = lambda items: ["API"] * len(items)
+    module.is_ready = lambda: True
+    module.warm_up_in_background = lambda: None
+    module.model_status = lambda: {"model": "stub", "ready": True, "error": None}
+    sys.modules["embedding_utils"] = module
+
+
+def point_client_at(url):
+    from kubernetes import client
+    import k8s_async
+
+    configuration = client.Configuration()
+    configuration.host = url
+    # Routes reload cluster config on every request; keep the fake server in place
+    k8s_async.load_cluster_config = lambda: configuration
+
+
+async def timed_get(test_client, path):
+    gc.collect()
+    start = time.perf_counter()
+    response = await test_client.get(path)
+    body = await response.get_data()
+    elapsed = time.perf_counter() - start
+    assert response.status_code == 200, body[:200]
+    return elapsed, len(body)
+
+
+async def timed_stream(test_client, path):
+    """(seconds to the first body chunk, seconds to the whole body) of a streamed response."""
+    gc.collect()
+    start = time.perf_counter()
+    async with test_client.request(path) as connection:
+        await connection.send_complete()
+        await connection.receive()
+        first = time.perf_counter() - start
+    elapsed = time.perf_counter() - start
+    assert connection.status_code == 200, connection.response_data[:200]
+    return first, elapsed
+
+
+async def traced_peak(coro):
+    # Separate passes: tracemalloc slows allocation-heavy code down a lot
+    tracemalloc.start()
+    await coro
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+async def run_point(app, server, services, pods_per_workload, repeat, report=True):
+    from k8s_informer import informers
+
+    namespace = f"bench-{services}"
+    objects = synthetic_namespace(namespace, services, pods_per_workload)
+    server.add_namespace(namespace, objects)
+    server.add_namespace(f"{namespace}-mem", objects)
+    test_client = app.test_client()
+    path = f"/api/environment-resources?env_name={namespace}"
+
+    server.reset_calls()
+    cold, size = await timed_get(test_client, path)
+    cold_lists = server.call_count("list")
+
+    server.reset_calls()
+    warm = statistics.median([(await timed_get(test_client, path))[0] for _ in range(repeat)])
+    warm_lists = server.call_count("list")
+
+    server.reset_calls()
+    first_line, ndjson = await timed_stream(test_client, path + "&format=ndjson")
+    ndjson_lists = server.call_count("list")
+
+    # The cold pass runs on a fresh informer
+    peak = await traced_peak(timed_get(test_client, f"/api/environment-resources?env_name={namespace}-mem"))
+    ndjson_peak = await traced_peak(timed_stream(test_client, path + "&format=ndjson"))
+
+    informers.stop(namespace)
+    informers.stop(f"{namespace}-mem")
+
+    if report:
+        print(f"{services:>8} {len(objects['Pod']):>7} {cold * 1000:>9.1f} {warm * 1000:>9.1f}"
+              f" {first_line * 1000:>7.1f}/{ndjson * 1000:<7.1f} {cold_lists:>5}/{warm_lists}/{ndjson_lists:<4}"
+              f" {size / 1024:>9.1f} {peak / 1e6:>7.1f}/{ndjson_peak / 1e6:<6.1f}")
+
+
+async def run(args):
+    server = FakeApiServer().start()
+    try:
+        point_client_at(server.url)
+
+        from quart import Quart
+        from k8s_resource_api import resource_api
+
+        app = Quart(__name__)
+        app.register_blueprint(resource_api)
+
+        print(f"classifier={args.classifier}, {args.pods_per_workload} pods per workload, warm = median of {args.repeat}")
+        print(f"{'services':>8} {'pods':>7} {'cold ms':>9} {'warm ms':>9} {'ndjson ms':>15} {'lists':>10} {'body KB':>9} {'peak MB':>14}")
+        # Untimed warm-up so one-off import and connection-pool costs stay out of the first point
+        await run_point(app, server, 1, 1, 1, report=False)
+        for services in args.services:
+            await run_point(app, server, services, args.pods_per_workload, args.repeat)
+    finally:
+        server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--services", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--pods-per-workload", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--classifier", choices=["stub", "real"], default="stub")
+    args = parser.parse_args()
+
+    if args.classifier == "stub":
+        stub_classifier()
+    # Keep cold-start snapshots out of the working tree
+    os.environ.setdefault("TOPOLOGY_SNAPSHOT_DIR", tempfile.mkdtemp(prefix="bench-snapshots-"))
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+# benchmarks/fake_apiserver.py
+
+"""
+Local stand-in for kube-apiserver serving synthetic namespaces, so the
+topology path can be benchmarked without a cluster. Supports what the app
+uses: namespaced and cluster-wide lists with limit/continue, and watches
+(held open until timeoutSeconds; no events are ever sent).
+
+    server = FakeApiServer()
+    server.add_namespace("bench", synthetic_namespace("bench", services=100))
+    server.start()
+    ...  # point the kubernetes client at server.url
+    server.stop()
+"""
+
+import asyncio
+import json
+import threading
+from collections import Counter
+
+from aiohttp import web
+
+KINDS = {
+    ("api/v1", "pods"): "Pod",
+    ("api/v1", "services"): "Service",
+    ("apis/apps/v1", "deployments"): "Deployment",
+    ("apis/apps/v1", "statefulsets"): "StatefulSet",
+    ("apis/apps/v1", "replicasets"): "ReplicaSet",
+    ("apis/batch/v1", "jobs"): "Job",
+    ("apis/batch/v1", "cronjobs"): "CronJob",
+}
+
+def _meta(namespace, name, serial, labels=None, owner=None):
+    meta = {
+        "name": name,
+        "namespace": namespace,
+        "uid": f"{namespace}-{name}",
+        "resourceVersion": str(1000 + serial),
+        "creationTimestamp": "2025-01-01T00:00:00Z",
+        "labels": labels or {},
+        "annotations": {"deployment.kubernetes.io/revision": "1"},
+        "managedFields": [{"manager": "kube-controller-manager", "operation": "Update", "apiVersion": "v1",
+                           "time": "2025-01-01T00:00:00Z", "fieldsType": "FieldsV1",
+                           "fieldsV1": {"f:metadata": {"f:labels": {".": {}}}}}],
+    }
+    if owner:
+        meta["ownerReferences"] = [{"apiVersion": "apps/v1", "kind": owner[0], "name": owner[1],
+                                    "uid": f"{namespace}-{owner[1]}", "controller": True, "blockOwnerDeletion": True}]
+    return meta
+
+
+def _pod_spec(app, image, port):
+    return {
+        "containers": [{
+            "name": app,
+            "image": image,
+            "ports": [{"containerPort": port, "protocol": "TCP"}],
+            "env": [{"name": f"VAR_{n}", "value": str(n)} for n in range(5)],
+            "resources": {"requests": {"cpu": "100m", "memory": "128Mi"}},
+        }],
+        "volumes": [{"name": "data", "persistentVolumeClaim": {"claimName": f"{app}-data"}}],
+    }
+
+
+# A spread of names/images so classifiers see realistic variety
+_APPS = [("api", "gcr.io/acme/api", 8080), ("postgres", "postgres:16", 5432), ("redis", "redis:7", 6379),
+         ("web-ui", "gcr.io/acme/web", 3000), ("queue-worker", "gcr.io/acme/worker", 9000),
+         ("nginx", "nginx:1.27", 80), ("billing", "gcr.io/acme/billing", 8080), ("search", "elasticsearch:8", 9200)]
+
+
+def synthetic_namespace(namespace, services=10, pods_per_workload=10, statefulset_every=10):
+    """
+    `services` Services, each selecting one workload with `pods_per_workload`
+    pods; every `statefulset_every`-th workload is a StatefulSet, the rest
+    are Deployments with a ReplicaSet. Adds one unselected Deployment and
+    one loose Pod per 10 services. Returns {kind: [raw objects]}.
+    """
+    objects = {kind: [] for kind in KINDS.values()}
+    serial = 0
+
+    def add(kind, obj):
+        nonlocal serial
+        serial += 1
+        objects[kind].append(obj)
+
+    def pods(app, image, port, count, owner):
+        for j in range(count):
+            name = f"{owner[1]}-{j}"
+            labels = {"app": app}
+            add("Pod", {"metadata": _meta(namespace, name, serial, labels, owner),
+                        "spec": _pod_spec(app, image, port),
+                        "status": {"phase": "Running", "podIP": f"10.0.{j // 250}.{j % 250}"}})
+
+    def workload(app, image, port, stateful):
+        labels = {"app": app}
+        spec = {"replicas": pods_per_workload, "selector": {"matchLabels": labels},
+                "template": {"metadata": {"labels": labels}, "spec": _pod_spec(app, image, port)}}
+        status = {"replicas": pods_per_workload, "readyReplicas": pods_per_workload}
+        if stateful:
+            add("StatefulSet", {"metadata": _meta(namespace, app, serial, labels), "spec": spec, "status": status})
+            pods(app, image, port, pods_per_workload, ("StatefulSet", app))
+        else:
+            add("Deployment", {"metadata": _meta(namespace, app, serial, labels), "spec": spec, "status": status})
+            rs = f"{app}-7d9f8c6b5"
+            add("ReplicaSet", {"metadata": _meta(namespace, rs, serial, labels, ("Deployment", app)), "spec": spec})
+            pods(app, image, port, pods_per_workload, ("ReplicaSet", rs))
+
+    for i in range(services):
+        base, image, port = _APPS[i % len(_APPS)]
+        app = f"{base}-{i}"
+        add("Service", {"metadata": _meta(namespace, f"{app}-svc", serial),
+                        "spec": {"selector": {"app": app}, "clusterIP": f"10.96.{i // 250}.{i % 250}",
+                                 "ports": [{"port": port, "protocol": "TCP"}]}})
+        workload(app, f"{image}:1.{i % 5}", port, stateful=(i + 1) % statefulset_every == 0)
+
+    for i in range(max(1, services // 10)):
+        base, image, port = _APPS[i % len(_APPS)]
+        workload(f"{base}-standalone-{i}", image, port, stateful=False)
+        add("Pod", {"metadata": _meta(namespace, f"{base}-debug-{i}", serial, {"debug": "true"}),
+                    "spec": _pod_spec(base, image, port), "status": {"phase": "Pending"}})
+
+    return objects
+
+
+class FakeApiServer:
+    """Runs the aiohttp app on its own loop in a background thread."""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self.calls = Counter()  # ("list" | "watch", plural) -> count
+        self._namespaces = {}
+        self._loop = None
+        self._runner = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def add_namespace(self, namespace, objects):
+        self._namespaces[namespace] = objects
+
+    def reset_calls(self):
+        self.calls.clear()
+
+    def call_count(self, verb=None):
+        return sum(n for (v, _), n in self.calls.items() if verb is None or v == verb)
+
+    def start(self):
+        started = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._serve, args=(started,), name="fake-apiserver", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    async def _shutdown(self):
+        await self._runner.cleanup()
+        # Watches still held open by clients that never disconnected
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def _serve(self, started):
+        asyncio.set_event_loop(self._loop)
+        app = web.Application()
+        app.router.add_route("GET", "/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, self.host, self.port)
+        self._loop.run_until_complete(site.start())
+        self.port = self._runner.addresses[0][1]
+        started.set()
+        self._loop.run_forever()
+
+    async def _handle(self, request):
+        path = request.path.strip("/").split("/")
+        if "namespaces" in path:
+            i = path.index("namespaces")
+            group, namespaces, plural = "/".join(path[:i]), [path[i + 1]], path[i + 2]
+        else:
+            group, namespaces, plural = "/".join(path[:-1]), list(self._namespaces), path[-1]
+        kind = KINDS.get((group, plural))
+        if kind is None:
+            raise web.HTTPNotFound()
+
+        if request.query.get("watch") in ("true", "1"):
+            self.calls["watch", plural] += 1
+            return await self._watch(request)
+
+        self.calls["list", plural] += 1
+        items = [obj for ns in namespaces for obj in self._namespaces.get(ns, {}).get(kind, [])]
+        start = int(request.query.get("continue") or 0)
+        limit = int(request.query.get("limit") or 0)
+        token = None
+        if limit:
+            if start + limit < len(items):
+                token = str(start + limit)
+            items = items[start:start + limit]
+        body = {"kind": f"{kind}List", "apiVersion": "v1",
+                "metadata": {"resourceVersion": "1000", "continue": token},
+                "items": [dict(obj, kind=kind) for obj in items]}
+        return web.Response(body=json.dumps(body).encode(), content_type="application/json")
+
+    async def _watch(self, request):
+        response = web.StreamResponse()
+        await response.prepare(request)
+        await asyncio.sleep(float(request.query.get("timeoutSeconds") or 60))
+        return response
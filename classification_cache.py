@@ -0,0 +1,122 @@
+# classification_cache.py
+
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from config import Config
+
+# Kubernetes generates name suffixes from this vowel-free alphabet, so most
+# real words ("cache", "redis") cannot be mistaken for hashes. Some can
+# ("html5", "xmpp2"), which is why only pod names are ever stripped.
+_SAFE = "[bcdfghjklmnpqrstvwxz2456789]"
+_DEPLOYMENT_POD = re.compile(rf"-{_SAFE}{{6,10}}-{_SAFE}{{5}}$")  # <name>-<pod-template-hash>-<random>
+_GENERATED = re.compile(rf"-{_SAFE}{{5}}$")                       # ReplicaSet/Job pod: <name>-<random>
+_NUMBERED = re.compile(r"-\d+$")                                    # StatefulSet ordinal, CronJob schedule time
+
+
+def pod_base_name(name):
+    """
+    Strips the controller-generated suffix from a pod name, so every replica
+    of an app shares one name. Only pod names carry these suffixes; Service,
+    Deployment and StatefulSet names are chosen by people and kept as is.
+    """
+    stripped = _DEPLOYMENT_POD.sub("", name)
+    if stripped == name:
+        stripped = _GENERATED.sub("", name)
+    stripped = _NUMBERED.sub("", stripped)
+    return stripped or name
+
+
+def split_image(image):
+    """`registry:5000/app:1.2@sha256:...` -> ("registry:5000/app", "1.2", "sha256:...")."""
+    if not image:
+        return "", None, None
+    repository, _, digest = image.partition("@")
+    tag = None
+    slash = repository.rfind("/")
+    colon = repository.rfind(":")
+    if colon > slash:
+        repository, tag = repository[:colon], repository[colon + 1:]
+    return repository, tag, digest or None
+
+
+def classification_identity(name, image=None):
+    """Cache key for a workload: its name (pods already reduced by pod_base_name) and image repository."""
+    return name, split_image(image)[0]
+
+
+class ClassificationCache:
+    """
+    LRU of service types keyed by (model, name, image repository), with an
+    optional SQLite file behind it so results survive restarts.
+    """
+
+    def __init__(self, maxsize=None, path=None):
+        self.maxsize = maxsize or Config.CLASSIFY_CACHE_SIZE
+        self.path = Config.CLASSIFY_CACHE_PATH if path is None else path
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._db = None
+        if self.path:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS classifications ("
+                "model TEXT, name TEXT, image TEXT, type TEXT, PRIMARY KEY (model, name, image))"
+            )
+            self._db.commit()
+
+    def get_many(self, keys):
+        """Cached types for `keys` ((model, name, image) tuples); missing keys are left out."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                value = self._entries.get(key)
+                if value is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = value
+                    self.hits += 1
+
+            missing = [key for key in keys if key not in found]
+            if self._db is not None:
+                for key in missing:
+                    row = self._db.execute(
+                        "SELECT type FROM classifications WHERE model = ? AND name = ? AND image = ?", key
+                    ).fetchone()
+                    if row is not None:
+                        found[key] = row[0]
+                        self._remember(key, row[0])
+                        self.disk_hits += 1
+            self.misses += sum(1 for key in missing if key not in found)
+        return found
+
+    def put_many(self, values):
+        with self._lock:
+            for key, value in values.items():
+                self._remember(key, value)
+            if self._db is not None and values:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO classifications (model, name, image, type) VALUES (?, ?, ?, ?)",
+                    [(*key, value) for key, value in values.items()],
+                )
+                self._db.commit()
+
+    def _remember(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "persistent": self._db is not None,
+        }
@@ -25,4 +25,50 @@ class Config:
         "port": int(os.getenv("ENVIRONMENT_DB_PORT", 5432)),
     }
 
-    CLUSTER_URL = os.getenv("CLUSTER_URL", "")
\ No newline at end of file
+    CLUSTER_URL = os.getenv("CLUSTER_URL", "")
+
+    # Runtime data the app writes (snapshots, model artifacts), kept out of the source tree
+    STATE_DIR = os.getenv("STATE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "gke-connect"))
+
+    # Worker threads for blocking kubernetes client calls made from routes (k8s_async.py)
+    K8S_EXECUTOR_WORKERS = int(os.getenv("K8S_EXECUTOR_WORKERS", 16))
+
+    # Namespace informer cache (k8s_informer.py)
+    INFORMER_RESYNC_SECONDS = int(os.getenv("INFORMER_RESYNC_SECONDS", 300))
+    INFORMER_IDLE_SECONDS = int(os.getenv("INFORMER_IDLE_SECONDS", 600))
+    INFORMER_SYNC_TIMEOUT = int(os.getenv("INFORMER_SYNC_TIMEOUT", 30))
+    INFORMER_WATCH_TIMEOUT_SECONDS = int(os.getenv("INFORMER_WATCH_TIMEOUT_SECONDS", 120))
+
+    # Objects per apiserver page in the NDJSON streaming mode (?format=ndjson)
+    STREAM_PAGE_SIZE = int(os.getenv("STREAM_PAGE_SIZE", 500))
+
+    # Seconds of watch events coalesced into one /ws/resources patch
+    WS_DEBOUNCE_SECONDS = float(os.getenv("WS_DEBOUNCE_SECONDS", 1.0))
+    # Queued messages per /ws/resources client before it is dropped as a slow consumer
+    WS_CLIENT_QUEUE_SIZE = int(os.getenv("WS_CLIENT_QUEUE_SIZE", 100))
+
+    # Persisted /api/environment-resources snapshots served on cold start (topology_snapshots.py)
+    TOPOLOGY_SNAPSHOT_DIR = os.getenv("TOPOLOGY_SNAPSHOT_DIR", os.path.join(STATE_DIR, "topology-snapshots"))
+    TOPOLOGY_SNAPSHOT_INTERVAL_SECONDS = int(os.getenv("TOPOLOGY_SNAPSHOT_INTERVAL_SECONDS", 60))
+
+    # Top-level topology nodes classified per embedding model call
+    CLASSIFY_BATCH_SIZE = int(os.getenv("CLASSIFY_BATCH_SIZE", 256))
+    # How long the classifier thread waits for more concurrent requests to join a batch
+    CLASSIFY_BATCH_WAIT_MS = float(os.getenv("CLASSIFY_BATCH_WAIT_MS", 5))
+    # torch intra-op threads available to the classifier thread
+    CLASSIFY_TORCH_THREADS = int(os.getenv("CLASSIFY_TORCH_THREADS", 2))
+
+    # Service-type classification cache (classification_cache.py); an empty path keeps it in memory only
+    CLASSIFY_CACHE_SIZE = int(os.getenv("CLASSIFY_CACHE_SIZE", 10000))
+    CLASSIFY_CACHE_PATH = os.getenv("CLASSIFY_CACHE_PATH", "")
+
+    # Encoder runtime for the service classifier: torch, onnx or onnx-int8 (embedding_backends.py)
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+    # Quantized graph in the model repo used by the onnx-int8 backend
+    EMBEDDING_ONNX_INT8_FILE = os.getenv("EMBEDDING_ONNX_INT8_FILE", "onnx/model_quint8_avx2.onnx")
+
+    # Prebuilt TYPE_EXAMPLES embeddings, memory-mapped by every worker (example_artifacts.py)
+    EMBEDDING_ARTIFACT_DIR = os.getenv("EMBEDDING_ARTIFACT_DIR", os.path.join(STATE_DIR, "model-artifacts"))
+
+    # Minimum share of name-keyword votes for a name rule to skip the embedding model (service_classifier.py)
+    CLASSIFY_NAME_RULE_CONFIDENCE = float(os.getenv("CLASSIFY_NAME_RULE_CONFIDENCE", 0.75))
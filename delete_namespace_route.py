@@ -1,7 +1,10 @@
 from quart import Blueprint, jsonify
-from kubernetes import client, config
+from kubernetes import client
 import asyncpg
 from config import Config
+from k8s_async import run_k8s, cluster_api_client
+from k8s_informer import informers
+from k8s_resource_api import snapshots
 
 # Blueprint for delete environment
 delete_environment = Blueprint("delete_environment", __name__)
@@ -17,16 +20,13 @@ def get_environment_db():
 async def delete_environment_and_resources(env_name):
     try:
         # Load Kubernetes config
-        try:
-            config.load_incluster_config()
-        except:
-            config.load_kube_config()
+        api_client = await cluster_api_client()
 
-        v1 = client.CoreV1Api()
+        v1 = client.CoreV1Api(api_client)
 
         # Delete Namespace
         try:
-            v1.delete_namespace(env_name)
+            await run_k8s(v1.delete_namespace, env_name)
             print(f"🗑️ Namespace '{env_name}' deletion initiated.")
         except client.exceptions.ApiException as e:
             if e.status != 404:
@@ -34,6 +34,10 @@ async def delete_environment_and_resources(env_name):
             else:
                 print(f"⚠️ Namespace '{env_name}' not found, skipping deletion.")
 
+        # Drop the cached and persisted topology, so a recreated environment never starts from this one
+        informers.stop(env_name)
+        await snapshots.delete(env_name)
+
         # Delete from clusters table
         try:
             conn = await get_cluster_db()
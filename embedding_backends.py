@@ -0,0 +1,57 @@
+# embedding_backends.py
+
+"""
+Encoders the service classifier can run on. Every backend is a
+SentenceTransformer with the same `encode()`; they differ in the runtime
+underneath:
+
+    torch        full-precision PyTorch (default)
+    onnx         the model's exported ONNX graph on onnxruntime
+    onnx-int8    an int8-quantized ONNX graph on onnxruntime
+
+The ONNX backends need `sentence-transformers[onnx]` (optimum + onnxruntime).
+Select one with the EMBEDDING_BACKEND setting.
+"""
+
+from config import Config
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+def _torch(model_name):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+
+def _onnx(model_name):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name, device="cpu", backend="onnx")
+
+
+def _onnx_int8(model_name):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(
+        model_name,
+        device="cpu",
+        backend="onnx",
+        model_kwargs={"file_name": Config.EMBEDDING_ONNX_INT8_FILE},
+    )
+
+
+BACKENDS = {
+    "torch": _torch,
+    "onnx": _onnx,
+    "onnx-int8": _onnx_int8,
+}
+
+
+def load_encoder(backend, model_name=MODEL_NAME):
+    loader = BACKENDS.get(backend)
+    if loader is None:
+        raise ValueError(f"Unknown embedding backend '{backend}'; expected one of: {', '.join(BACKENDS)}")
+    return loader(model_name)
+
+
+def model_id(backend, model_name=MODEL_NAME):
+    """Identifies a model + backend pair in caches; quantized outputs may differ slightly."""
+    return model_name if backend == "torch" else f"{model_name}@{backend}"
@@ -1,4 +1,10 @@
-from sentence_transformers import SentenceTransformer, util
+import os
+import threading
+import numpy as np
+from classification_cache import ClassificationCache, classification_identity
+from embedding_backends import MODEL_NAME, load_encoder, model_id
+from example_artifacts import load_example_matrix, save_example_matrix
+from config import Config
 
 TYPE_EXAMPLES = {
     "API": ["auth-service", "api-gateway", "user-api"],
@@ -11,27 +17,123 @@ TYPE_EXAMPLES = {
 
 VALID_TYPES = list(TYPE_EXAMPLES.keys())
 
-embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+BACKEND = Config.EMBEDDING_BACKEND
+MODEL_ID = model_id(BACKEND)
+
+# Inference runs on the classifier thread (inference_worker.py) with its own
+# thread budget; keep the tokenizer from spawning a pool of its own as well.
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
 
 example_texts = [(t, name) for t, names in TYPE_EXAMPLES.items() for name in names]
-example_embeddings = [(t, embedding_model.encode(name)) for t, name in example_texts]
 
-def embed_classify(name, image=None):
+# The model is loaded off the request path (see warm_up_in_background) instead
+# of at import time, so importing this module costs nothing.
+embedding_model = None
+example_types = [t for t, _ in example_texts]
+example_matrix = None  # one L2-normalized row per example (read-only when memory-mapped); dot product = cosine
+
+# Results keyed by normalized identity, so replicas and image tags of one app share an entry
+classification_cache = ClassificationCache()
+
+_load_lock = threading.Lock()
+_loader_lock = threading.Lock()  # separate from _load_lock, which is held for the whole load
+_ready = threading.Event()
+_loader = None
+_load_error = None
+
+
+class ModelNotReady(Exception):
+    pass
+
+
+def load_model():
+    """Loads the model and encodes the examples. Blocking; later calls are no-ops."""
+    global embedding_model, example_matrix
+    with _load_lock:
+        if _ready.is_set():
+            return
+        model = load_encoder(BACKEND)
+        # Prebuilt, memory-mapped examples when available (python -m example_artifacts)
+        matrix = load_example_matrix(MODEL_ID, example_texts)
+        if matrix is None:
+            matrix = np.asarray(model.encode([name for _, name in example_texts], normalize_embeddings=True), dtype=np.float32)
+            try:
+                save_example_matrix(MODEL_ID, example_texts, matrix)
+            except OSError as e:
+                print(f"[Embedding] Could not write example artifact: {e}")
+        embedding_model, example_matrix = model, matrix
+        _ready.set()
+
+
+def _load_in_thread():
+    global _load_error
     try:
-        query = name
-        if image:
-            query += f" {image}"
-        query_embedding = embedding_model.encode(query)
-
-        best_score = -1
-        best_type = "Unknown"
-        for t, emb in example_embeddings:
-            score = util.cos_sim(query_embedding, emb).item()
-            if score > best_score:
-                best_score = score
-                best_type = t
-
-        return best_type
+        load_model()
+        _load_error = None
+        print(f"[Embedding] Model '{MODEL_ID}' ready")
     except Exception as e:
-        print("[Embedding Classification Error]", e)
-        return "Unknown"
\ No newline at end of file
+        _load_error = str(e)
+        print(f"[Embedding] Model load failed, classifying by name: {e}")
+
+
+def warm_up_in_background():
+    """Starts loading the model on a daemon thread unless it is loaded, loading or failed to load."""
+    global _loader
+    with _loader_lock:
+        if _ready.is_set() or _loader is not None:
+            return
+        _loader = threading.Thread(target=_load_in_thread, name="embedding-warmup", daemon=True)
+        _loader.start()
+
+
+def is_ready():
+    return _ready.is_set()
+
+
+def model_status():
+    return {"model": MODEL_NAME, "backend": BACKEND, "ready": _ready.is_set(), "error": _load_error, "cache": classification_cache.stats()}
+
+
+def classification_text(name, image=None):
+    return f"{name} {image}" if image else name
+
+
+def classify_texts(texts):
+    """Uncached classification: one `encode` call, one matrix multiply against the example matrix."""
+    queries = embedding_model.encode(texts, normalize_embeddings=True)
+    best = np.argmax(np.asarray(queries, dtype=np.float32) @ example_matrix.T, axis=1)
+    return [example_types[i] for i in best]
+
+
+def embed_classify_batch(items):
+    """
+    Types for a list of (name, image) pairs. Cached identities are answered
+    from the classification cache; the rest go through classify_texts in
+    a single batch.
+    """
+    if not _ready.is_set():
+        warm_up_in_background()
+        raise ModelNotReady(f"Embedding model '{MODEL_ID}' is still loading")
+
+    keys = [(MODEL_ID, *classification_identity(name, image)) for name, image in items]
+    unique_keys = list(dict.fromkeys(keys))
+    types = classification_cache.get_many(unique_keys)
+    missing = [key for key in unique_keys if key not in types]
+    if missing:
+        try:
+            texts = [classification_text(name, image) for _, name, image in missing]
+            types.update(zip(missing, classify_texts(texts)))
+        except Exception as e:
+            print("[Embedding Classification Error]", e)
+        else:
+            # A failed cache write (e.g. a locked shared SQLite file) must not cost the computed types
+            try:
+                classification_cache.put_many({key: types[key] for key in missing})
+            except Exception as e:
+                print("[Classification Cache Error]", e)
+
+    return [types.get(key, "Unknown") for key in keys]
+
+
+def embed_classify(name, image=None):
+    return embed_classify_batch([(name, image)])[0]
@@ -0,0 +1,74 @@
+# example_artifacts.py
+
+"""
+Precomputed TYPE_EXAMPLES embeddings for the service classifier. The matrix
+is written once per (model, example set) to a `.npy` file whose name carries
+the model id and a hash of the examples, and workers memory-map it read-only
+instead of re-encoding the examples at startup; every process shares the
+same page-cache copy. Editing TYPE_EXAMPLES changes the hash, so a stale
+file is simply never opened and a fresh one is built on the next load.
+
+Build step (run it in the image build or before rolling out workers):
+
+    python -m example_artifacts
+"""
+
+import hashlib
+import json
+import os
+import re
+import numpy as np
+from config import Config
+
+
+def examples_digest(example_texts):
+    """Stable hash of the ordered (type, name) example list."""
+    payload = json.dumps([list(pair) for pair in example_texts]).encode()
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
+def artifact_path(model_id, example_texts, directory=None):
+    safe_model = re.sub(r"[^A-Za-z0-9_.-]", "_", model_id)
+    name = f"examples-{safe_model}-{examples_digest(example_texts)}.npy"
+    return os.path.join(directory or Config.EMBEDDING_ARTIFACT_DIR, name)
+
+
+def load_example_matrix(model_id, example_texts):
+    """The memory-mapped example matrix, or None when it has not been built for this model and example set."""
+    path = artifact_path(model_id, example_texts)
+    try:
+        matrix = np.load(path, mmap_mode="r")
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"[Embedding] Ignoring unreadable example artifact {path}: {e}")
+        return None
+    if matrix.ndim != 2 or matrix.shape[0] != len(example_texts):
+        print(f"[Embedding] Ignoring example artifact {path} with shape {matrix.shape}")
+        return None
+    return matrix
+
+
+def save_example_matrix(model_id, example_texts, matrix):
+    path = artifact_path(model_id, example_texts)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Write-then-rename, so a worker never maps a half-written file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.asarray(matrix, dtype=np.float32))
+    os.replace(tmp_path, path)
+    return path
+
+
+def main():
+    import embedding_utils
+    from embedding_backends import load_encoder
+
+    model = load_encoder(embedding_utils.BACKEND)
+    matrix = model.encode([name for _, name in embedding_utils.example_texts], normalize_embeddings=True)
+    path = save_example_matrix(embedding_utils.MODEL_ID, embedding_utils.example_texts, matrix)
+    print(f"Wrote {path} ({len(embedding_utils.example_texts)} examples)")
+
+
+if __name__ == "__main__":
+    main()
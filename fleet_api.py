@@ -0,0 +1,118 @@
+from quart import Blueprint, jsonify
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+from collections import Counter, defaultdict
+import asyncio
+import asyncpg
+import traceback
+
+from k8s_async import run_k8s, cluster_api_client
+from k8s_paged_source import iter_pages
+from k8s_resource_api import ai_infer_service_types, service_classification_input
+from label_index import LabelIndex
+from single_flight import SingleFlight
+from config import Config
+
+fleet_api = Blueprint("fleet_api", __name__)
+
+fleet_flight = SingleFlight("fleet_overview")
+
+def get_cluster_db():
+    return asyncpg.connect(**Config.CLUSTER_DB_CONFIG)
+
+def cluster_list_functions(api_client):
+    """Cluster-scoped list functions: one call per kind covers every namespace."""
+    core_v1 = client.CoreV1Api(api_client)
+    apps_v1 = client.AppsV1Api(api_client)
+    return {
+        "pods": core_v1.list_pod_for_all_namespaces,
+        "deployments": apps_v1.list_deployment_for_all_namespaces,
+        "statefulsets": apps_v1.list_stateful_set_for_all_namespaces,
+        "services": core_v1.list_service_for_all_namespaces,
+    }
+
+def list_by_namespace(kind, list_fn):
+    buckets = defaultdict(list)
+    for obj in iter_pages(kind, list_fn, page_size=Config.STREAM_PAGE_SIZE):
+        buckets[obj.namespace].append(obj)
+    return buckets
+
+async def fetch_clusters():
+    conn = await get_cluster_db()
+    try:
+        return await conn.fetch(
+            "SELECT env_name, cluster_name, is_connected, last_checked FROM clusters ORDER BY env_name"
+        )
+    finally:
+        await conn.close()
+
+def workload_summary(workloads):
+    ready = sum(1 for obj in workloads if (obj.ready_replicas or 0) >= (obj.replicas or 0))
+    return {"total": len(workloads), "ready": ready}
+
+def service_inputs(env_name, objects):
+    """Classifier inputs for an environment's Services, matched to workloads the way the topology does it."""
+    workloads = {}
+    for kind in ("deployments", "statefulsets"):
+        index = LabelIndex()
+        by_name = {}
+        for obj in objects[kind].get(env_name, []):
+            index.add(obj.name, obj.labels)
+            by_name[obj.name] = obj
+        workloads[kind] = (index, by_name)
+
+    return [
+        service_classification_input(svc, [
+            by_name[name]
+            for index, by_name in workloads.values()
+            for name in sorted(index.select(svc.selector))
+        ])
+        for svc in objects["services"].get(env_name, [])
+    ]
+
+def environment_summary(row, objects, service_types):
+    pods = objects["pods"].get(row["env_name"], [])
+
+    return {
+        "env_name": row["env_name"],
+        "cluster_name": row["cluster_name"] or "N/A",
+        "connected": row["is_connected"],
+        "last_checked": row["last_checked"],
+        "counts": {kind: len(objects[kind].get(row["env_name"], [])) for kind in objects},
+        "pods": dict(Counter(pod.phase for pod in pods)),
+        "deployments": workload_summary(objects["deployments"].get(row["env_name"], [])),
+        "statefulsets": workload_summary(objects["statefulsets"].get(row["env_name"], [])),
+        "service_types": dict(service_types),
+    }
+
+async def build_fleet_overview():
+    api_client = await cluster_api_client()
+
+    # One paged cluster-wide list per kind, all in flight together with the DB query
+    kinds = cluster_list_functions(api_client)
+    clusters, *lists = await asyncio.gather(
+        fetch_clusters(),
+        *(run_k8s(list_by_namespace, kind, fn) for kind, fn in kinds.items())
+    )
+    objects = dict(zip(kinds, lists))
+
+    # Every environment's Services go to the classifier as one batch
+    inputs = [service_inputs(row["env_name"], objects) for row in clusters]
+    types = iter(await ai_infer_service_types([item for items in inputs for item in items]))
+
+    return [
+        environment_summary(row, objects, Counter(next(types) for _ in items))
+        for row, items in zip(clusters, inputs)
+    ]
+
+@fleet_api.route("/api/fleet-overview", methods=["GET"])
+async def get_fleet_overview():
+    try:
+        # Concurrent dashboard refreshes share one set of cluster-wide lists
+        environments = await fleet_flight.do("fleet", build_fleet_overview)
+        return jsonify({"environments": environments})
+    except ApiException as e:
+        return jsonify({"error": f"Kubernetes API error: {e.reason}"}), 500
+    except Exception as e:
+        print("Exception:", traceback.format_exc())
+        return jsonify({"error": str(e)}), 500
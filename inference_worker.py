@@ -0,0 +1,97 @@
+# inference_worker.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+
+
+def _limit_torch_threads():
+    # Bounds the intra-op threads the model may use, so inference never competes
+    # with the web workers for every core
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(Config.CLASSIFY_TORCH_THREADS)
+
+
+class ClassificationWorker:
+    """
+    Runs `classify_batch` on one dedicated thread instead of the event loop.
+    Items from concurrent callers are queued and micro-batched: a batch is
+    sent once it holds `max_batch` items or `max_wait` seconds after its
+    first request arrived, whichever comes first.
+    """
+
+    def __init__(self, classify_batch, max_batch=None, max_wait=None):
+        self.max_batch = max_batch or Config.CLASSIFY_BATCH_SIZE
+        self.max_wait = Config.CLASSIFY_BATCH_WAIT_MS / 1000 if max_wait is None else max_wait
+        self.requests = 0
+        self.batches = 0
+        self.items = 0
+        self._classify_batch = classify_batch
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="classifier", initializer=_limit_torch_threads)
+        self._queue = None
+        self._task = None
+
+    async def classify(self, items):
+        """Types for a list of (name, image) pairs, in order."""
+        if not items:
+            return []
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        self.requests += 1
+        self._queue.put_nowait((items, future))
+        return await future
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self._queue.get()]
+            size = len(pending[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(request)
+                size += len(request[0])
+            await self._dispatch(loop, pending)
+
+    async def _dispatch(self, loop, pending):
+        items = [item for request_items, _ in pending for item in request_items]
+        self.batches += 1
+        self.items += len(items)
+        try:
+            types = await loop.run_in_executor(self._executor, self._classify_batch, items)
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for request_items, future in pending:
+            # Callers that went away while waiting simply get nothing
+            if not future.done():
+                future.set_result(types[offset:offset + len(request_items)])
+            offset += len(request_items)
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
@@ -0,0 +1,37 @@
+# k8s_async.py
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from kubernetes import client, config
+from config import Config
+
+# The kubernetes client is synchronous; every call from a Quart route goes
+# through this bounded pool so apiserver round-trips never block the event loop.
+_executor = ThreadPoolExecutor(max_workers=Config.K8S_EXECUTOR_WORKERS, thread_name_prefix="k8s")
+
+
+async def run_k8s(fn, *args, **kwargs):
+    """Runs a blocking kubernetes client call on the k8s executor and awaits its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+
+def load_cluster_config():
+    """
+    The app's own cluster config (in-cluster, else kubeconfig), loaded into a
+    Configuration of its own. Loading never touches the process-wide default,
+    which any executor thread could otherwise swap between one request's
+    config load and its API calls.
+    """
+    configuration = client.Configuration()
+    try:
+        config.load_incluster_config(client_configuration=configuration)
+    except config.ConfigException:
+        config.load_kube_config(client_configuration=configuration)
+    return configuration
+
+
+async def cluster_api_client():
+    """ApiClient bound to the app's own cluster config; pass it to every XxxApi() a route builds."""
+    return client.ApiClient(await run_k8s(load_cluster_config))
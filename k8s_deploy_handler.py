@@ -1,6 +1,10 @@
-from kubernetes import client, config
 from kubernetes.utils import create_from_yaml
 import os
+from k8s_async import run_k8s, cluster_api_client
+
+def write_file(path, content):
+    with open(path, "w") as f:
+        f.write(content)
 
 async def deploy_to_namespace(env_name: str, yaml_content: str):
     """
@@ -8,19 +12,14 @@ async def deploy_to_namespace(env_name: str, yaml_content: str):
     """
     try:
         # Load kubeconfig or in-cluster config
-        try:
-            config.load_incluster_config()
-        except:
-            config.load_kube_config()
+        k8s_client = await cluster_api_client()
 
         # Save the YAML to a temporary file
         temp_yaml_path = f"/tmp/{env_name}_deployment.yaml"
-        with open(temp_yaml_path, "w") as f:
-            f.write(yaml_content)
+        await run_k8s(write_file, temp_yaml_path, yaml_content)
 
         # Deploy using Kubernetes utils
-        k8s_client = client.ApiClient()
-        created_objects = create_from_yaml(k8s_client, temp_yaml_path, namespace=env_name)
+        created_objects = await run_k8s(create_from_yaml, k8s_client, temp_yaml_path, namespace=env_name)
 
         os.remove(temp_yaml_path)  # Clean up the temp file
         messages = [
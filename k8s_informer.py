@@ -0,0 +1,382 @@
+# k8s_informer.py
+
+import hashlib
+import json
+import threading
+import time
+from kubernetes import client
+from kubernetes.client.rest import ApiException
+from kubernetes.watch.watch import iter_resp_lines
+from config import Config
+from k8s_records import RECORD_TYPES, list_records
+from label_index import LabelIndex
+from owner_graph import OwnerGraph, KIND_NAMES
+from resource_serializer import NodeSerializer
+
+RETRY_BACKOFF_SECONDS = 5
+CONNECT_TIMEOUT_SECONDS = 10
+# Client-side read allowance past a watch's server-side timeoutSeconds
+WATCH_READ_MARGIN_SECONDS = 15
+# Initial list errors retrying cannot fix: no such namespace, or no access to it
+FATAL_SYNC_STATUSES = (403, 404)
+JANITOR_INTERVAL_SECONDS = 60
+FINGERPRINT_MODULUS = 1 << 128
+
+
+def object_fingerprint(obj):
+    key = f"{obj.uid}/{obj.resource_version}".encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=16).digest(), "big")
+
+
+def informer_list_functions(api_client):
+    """Namespaced list functions, bound to `api_client`, for every kind the informer keeps in memory."""
+    core_v1 = client.CoreV1Api(api_client)
+    apps_v1 = client.AppsV1Api(api_client)
+    batch_v1 = client.BatchV1Api(api_client)
+    return {
+        "pods": core_v1.list_namespaced_pod,
+        "services": core_v1.list_namespaced_service,
+        "deployments": apps_v1.list_namespaced_deployment,
+        "statefulsets": apps_v1.list_namespaced_stateful_set,
+        "replicasets": apps_v1.list_namespaced_replica_set,
+        "jobs": batch_v1.list_namespaced_job,
+        "cronjobs": batch_v1.list_namespaced_cron_job,
+    }
+
+
+class NamespaceInformer:
+    """
+    Lists every watched kind in a namespace once, then keeps the in-memory
+    copy current from watch events. Watches resume from the last seen
+    resourceVersion (bookmarks included); a full relist happens every
+    `resync_seconds` and whenever the apiserver answers a watch with 410 Gone.
+    Every call goes through `api_client`, so the informer stays on the
+    cluster it was started for.
+    """
+
+    def __init__(self, namespace, api_client, resync_seconds=None):
+        self.namespace = namespace
+        self.resync_seconds = resync_seconds or Config.INFORMER_RESYNC_SECONDS
+        self.last_access = float("-inf")  # not yet requested through InformerRegistry.get()
+        self.holders = 0
+
+        self._list_functions = informer_list_functions(api_client)
+        self._lock = threading.Lock()
+        self._stores = {kind: {} for kind in self._list_functions}
+        self._indexes = {kind: LabelIndex() for kind in self._list_functions}
+        # kind -> (sum of object fingerprints mod 2**128, object count), kept current by _relist/_apply
+        self._fingerprints = {kind: (0, 0) for kind in self._list_functions}
+        self.nodes = NodeSerializer()
+        self._synced = {kind: threading.Event() for kind in self._list_functions}
+        self._errors = {}
+        self.failure = None  # the FATAL_SYNC_STATUSES error that stopped the informer, if any
+        self._resource_versions = {}
+        self._watches = {}
+        self._listeners = []
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for kind, list_fn in self._list_functions.items():
+            thread = threading.Thread(
+                target=self._run,
+                args=(kind, list_fn),
+                name=f"informer-{self.namespace}-{kind}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        # Shutting down the open watch sockets unblocks the threads right away;
+        # close() from this thread would wait on the read the watch thread is blocked in
+        for response in list(self._watches.values()):
+            try:
+                response.shutdown()
+            except Exception:
+                pass
+
+    def is_stopped(self):
+        return self._stop.is_set()
+
+    def touch(self):
+        self.last_access = time.monotonic()
+
+    def is_synced(self):
+        return all(event.is_set() for event in self._synced.values())
+
+    def wait_until_synced(self, timeout):
+        """
+        Blocks until every kind has completed its initial list. Raises the
+        list error if a kind failed before ever syncing, or TimeoutError.
+        """
+        deadline = time.monotonic() + timeout
+        for kind, event in self._synced.items():
+            while not event.wait(0.1):
+                if self.failure is not None:
+                    raise self.failure
+                if kind in self._errors:
+                    raise self._errors[kind]
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Informer for '{self.namespace}' did not sync {kind} within {timeout}s")
+
+    def add_listener(self, listener):
+        """Registers `listener(kind, event_type, obj)`, called from the watch threads after every change."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def list(self, kind):
+        with self._lock:
+            return list(self._stores[kind].values())
+
+    def get(self, kind, name):
+        with self._lock:
+            return self._stores[kind].get(name)
+
+    def select(self, kind, selector):
+        """Objects of `kind` matching a label selector, resolved through the label index."""
+        with self._lock:
+            store = self._stores[kind]
+            names = self._indexes[kind].select(selector)
+            return [store[name] for name in sorted(names) if name in store]
+
+    def version_token(self, kinds=None):
+        """
+        Order-independent fingerprint of the cached (uid, resourceVersion)
+        pairs; it changes whenever any object is added, modified or deleted.
+        Per-kind sums are maintained as events arrive, so this is O(kinds).
+        """
+        total = 0
+        count = 0
+        with self._lock:
+            for kind in kinds or self._stores:
+                kind_total, kind_count = self._fingerprints[kind]
+                total += kind_total
+                count += kind_count
+        return f"{count:x}-{total % FINGERPRINT_MODULUS:032x}"
+
+    def owner_graph(self):
+        """Ownership graph over the cached pods, ReplicaSets, Jobs and their controllers."""
+        with self._lock:
+            return OwnerGraph.build({kind: list(self._stores[kind].values()) for kind in KIND_NAMES})
+
+    # --- internals ---
+
+    def _run(self, kind, list_fn):
+        # Relist only on first sync, on 410 Gone and once per resync period;
+        # every other disconnect resumes the watch from the last seen resourceVersion.
+        relist_at = 0
+        while not self._stop.is_set():
+            try:
+                if self._resource_versions.get(kind) is None or time.monotonic() >= relist_at:
+                    self._relist(kind, list_fn)
+                    relist_at = time.monotonic() + self.resync_seconds
+                self._watch(kind, list_fn, relist_at)
+            except ApiException as e:
+                if e.status == 410:
+                    print(f"[Informer] {self.namespace}/{kind}: resourceVersion {self._resource_versions.get(kind)} expired (410 Gone), relisting")
+                    self._resource_versions[kind] = None
+                    continue
+                print(f"[Informer] {self.namespace}/{kind}: API error {e.status} {e.reason}")
+                if e.status in FATAL_SYNC_STATUSES and not self._synced[kind].is_set():
+                    # Relisting every RETRY_BACKOFF_SECONDS until idle eviction would only repeat
+                    # the error; stop instead, and the registry starts afresh on the next request
+                    self.failure = e
+                    self.stop()
+                    print(f"[Informer] Stopped namespace '{self.namespace}': initial {kind} list failed")
+                    break
+                self._fail(kind, e)
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                print(f"[Informer] {self.namespace}/{kind}: {e}; resuming from resourceVersion {self._resource_versions.get(kind)}")
+                self._fail(kind, e)
+
+    def _fail(self, kind, error):
+        if not self._synced[kind].is_set():
+            self._errors[kind] = error
+        self._stop.wait(RETRY_BACKOFF_SECONDS)
+
+    def _relist(self, kind, list_fn):
+        records, resource_version, _ = list_records(
+            kind, list_fn, self.namespace,
+            _request_timeout=(CONNECT_TIMEOUT_SECONDS, Config.INFORMER_SYNC_TIMEOUT),
+        )
+        store = {obj.name: obj for obj in records}
+        fingerprint = sum(object_fingerprint(obj) for obj in store.values()) % FINGERPRINT_MODULUS
+        with self._lock:
+            self._stores[kind] = store
+            self._fingerprints[kind] = (fingerprint, len(store))
+            index = self._indexes[kind]
+            index.clear()
+            for obj in records:
+                index.add(obj.name, obj.labels)
+            live_uids = {obj.uid for store in self._stores.values() for obj in store.values()}
+        self.nodes.retain(live_uids)
+        self._errors.pop(kind, None)
+        self._synced[kind].set()
+        self._resource_versions[kind] = resource_version
+        self._notify(kind, "RELIST", None)
+
+    def _watch(self, kind, list_fn, relist_at):
+        # Each watch request is bounded so it returns in time for the next
+        # resync; a normal end simply resumes from the last resourceVersion.
+        # timeout_seconds is enforced by the apiserver, so a silently dropped
+        # connection would block the read forever and leave the cache stale
+        # while it still looks synced; the client-side read timeout turns that
+        # into an error, and the watch resumes like after any other disconnect.
+        timeout = max(1, int(min(Config.INFORMER_WATCH_TIMEOUT_SECONDS, relist_at - time.monotonic())))
+        record_type = RECORD_TYPES[kind]
+        response = list_fn(
+            self.namespace,
+            watch=True,
+            resource_version=self._resource_versions[kind],
+            allow_watch_bookmarks=True,
+            timeout_seconds=timeout,
+            _request_timeout=(CONNECT_TIMEOUT_SECONDS, timeout + WATCH_READ_MARGIN_SECONDS),
+            _preload_content=False,
+        )
+        self._watches[kind] = response
+        try:
+            if not 200 <= response.status <= 299:
+                raise ApiException(status=response.status, reason=response.reason)
+            # Raw event stream: each line is parsed once straight into a record
+            for line in iter_resp_lines(response):
+                if self._stop.is_set():
+                    break
+                if not line:
+                    continue
+                event = json.loads(line)
+                event_type = event["type"]
+                raw = event["object"]
+                if event_type == "ERROR":
+                    raise ApiException(status=raw.get("code"), reason=f"{raw.get('reason')}: {raw.get('message')}")
+                if event_type != "BOOKMARK":
+                    self._apply(kind, event_type, record_type(raw))
+                self._resource_versions[kind] = raw["metadata"]["resourceVersion"]
+        finally:
+            self._watches.pop(kind, None)
+            response.close()
+            response.release_conn()
+
+    def _apply(self, kind, event_type, obj):
+        with self._lock:
+            total, count = self._fingerprints[kind]
+            if event_type == "DELETED":
+                old = self._stores[kind].pop(obj.name, None)
+                self._indexes[kind].remove(obj.name)
+                self.nodes.evict(obj.uid)
+            elif event_type in ("ADDED", "MODIFIED"):
+                old = self._stores[kind].get(obj.name)
+                self._stores[kind][obj.name] = obj
+                self._indexes[kind].add(obj.name, obj.labels)
+                total += object_fingerprint(obj)
+                count += 1
+            else:
+                return
+            if old is not None:
+                total -= object_fingerprint(old)
+                count -= 1
+            self._fingerprints[kind] = (total % FINGERPRINT_MODULUS, count)
+        self._notify(kind, event_type, obj)
+
+    def _notify(self, kind, event_type, obj):
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(kind, event_type, obj)
+            except Exception as e:
+                print(f"[Informer] {self.namespace}: listener failed: {e}")
+
+
+class InformerRegistry:
+    """One informer per namespace, started on first use and evicted once idle."""
+
+    def __init__(self, idle_seconds=None):
+        self.idle_seconds = idle_seconds or Config.INFORMER_IDLE_SECONDS
+        self._lock = threading.Lock()
+        self._informers = {}
+        self._janitor = None
+
+    def get(self, namespace, api_client):
+        """The namespace's informer; `api_client` is only used to start one that is not running yet."""
+        with self._lock:
+            informer = self._get_or_start(namespace, api_client)
+            informer.touch()
+            return informer
+
+    def acquire(self, namespace, api_client):
+        """Like get(), but pins the informer until release(); used by long-lived subscribers."""
+        with self._lock:
+            informer = self._get_or_start(namespace, api_client)
+            informer.holders += 1
+            return informer
+
+    def release(self, informer):
+        """
+        Drops a pin taken by acquire(). The last holder stops the informer's
+        watches right away unless plain get() callers used it recently, in
+        which case the idle janitor decides. A pin on an informer that has
+        since been stopped and replaced is simply dropped.
+        """
+        namespace = informer.namespace
+        with self._lock:
+            if self._informers.get(namespace) is not informer:
+                return
+            informer.holders = max(0, informer.holders - 1)
+            if informer.holders == 0 and time.monotonic() - informer.last_access > self.idle_seconds:
+                self._informers.pop(namespace).stop()
+                print(f"[Informer] Stopped namespace '{namespace}' after its last subscriber left")
+
+    def stop(self, namespace):
+        """Stops a namespace's informer now, whoever still holds it."""
+        with self._lock:
+            informer = self._informers.pop(namespace, None)
+        if informer is not None:
+            informer.stop()
+
+    def evict_idle(self):
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                ns for ns, inf in self._informers.items()
+                if inf.is_stopped() or (inf.holders == 0 and now - inf.last_access > self.idle_seconds)
+            ]
+            for namespace in idle:
+                self._informers.pop(namespace).stop()
+                print(f"[Informer] Evicted idle namespace '{namespace}'")
+
+    def _get_or_start(self, namespace, api_client):
+        informer = self._informers.get(namespace)
+        # A stopped informer failed its initial sync; the next request tries again
+        if informer is None or informer.is_stopped():
+            informer = NamespaceInformer(namespace, api_client)
+            informer.start()
+            self._informers[namespace] = informer
+            print(f"[Informer] Started for namespace '{namespace}'")
+        self._ensure_janitor()
+        return informer
+
+    def _ensure_janitor(self):
+        if self._janitor is None or not self._janitor.is_alive():
+            self._janitor = threading.Thread(target=self._janitor_loop, name="informer-janitor", daemon=True)
+            self._janitor.start()
+
+    def _janitor_loop(self):
+        while True:
+            time.sleep(JANITOR_INTERVAL_SECONDS)
+            self.evict_idle()
+
+
+informers = InformerRegistry()
+
+
+def get_informer(namespace, api_client):
+    return informers.get(namespace, api_client)
@@ -0,0 +1,112 @@
+# k8s_paged_source.py
+
+import asyncio
+from k8s_async import run_k8s
+from k8s_informer import informer_list_functions
+from k8s_records import list_records
+from label_index import LabelIndex
+from owner_graph import OwnerGraph, KIND_NAMES
+from resource_serializer import NodeSerializer
+from config import Config
+
+
+def list_page(kind, list_fn, *args, page_size, token=None):
+    """One limit/continue page of a list call: (records, continue token or None)."""
+    kwargs = {"limit": page_size}
+    if token:
+        kwargs["_continue"] = token
+    records, _, token = list_records(kind, list_fn, *args, **kwargs)
+    return records, token or None
+
+
+def iter_pages(kind, list_fn, *args, page_size):
+    """Yields every record of a list call, fetched `page_size` at a time via limit/continue."""
+    token = None
+    while True:
+        records, token = list_page(kind, list_fn, *args, page_size=page_size, token=token)
+        yield from records
+        if not token:
+            return
+
+
+class PagedNamespaceSource:
+    """
+    One-shot topology source for the streaming mode of
+    /api/environment-resources. load() pages in only the controllers the
+    topology hangs off (services, deployments, statefulsets, replicasets);
+    pods, the bulk of a large namespace, are never held as a whole but
+    fetched one page at a time through pod_pages(). Until then the source
+    looks like a namespace without pods, so plan_environment_resources()
+    runs on it unchanged.
+    """
+
+    CONTROLLER_KINDS = ("services", "deployments", "statefulsets", "replicasets")
+    INDEXED_KINDS = ("deployments", "statefulsets")
+
+    def __init__(self, namespace, api_client, page_size=None):
+        self.namespace = namespace
+        self.api_client = api_client
+        self.page_size = page_size or Config.STREAM_PAGE_SIZE
+        self._list_functions = None
+        self._stores = {"pods": {}}
+        self._indexes = {"pods": LabelIndex()}
+        self._owners = None
+        self._workload_uids = set()
+        self._replicaset_owners = {}
+        self.nodes = NodeSerializer()
+
+    async def load(self):
+        # Controllers page through the apiserver concurrently on the k8s executor
+        self._list_functions = informer_list_functions(self.api_client)
+        kinds = self.CONTROLLER_KINDS
+        stores = await asyncio.gather(*(run_k8s(self._load_kind, kind, self._list_functions[kind]) for kind in kinds))
+        self._stores.update(zip(kinds, stores))
+
+        for kind in self.INDEXED_KINDS:
+            index = LabelIndex()
+            for name, obj in self._stores[kind].items():
+                index.add(name, obj.labels)
+            self._indexes[kind] = index
+
+        self._owners = OwnerGraph.build({kind: self._stores[kind].values() for kind in KIND_NAMES if kind in self._stores})
+        self._workload_uids = {obj.uid for kind in self.INDEXED_KINDS for obj in self._stores[kind].values()}
+        self._replicaset_owners = {
+            rs.uid: ref.uid
+            for rs in self._stores["replicasets"].values()
+            for ref in rs.owner_references
+            if ref.kind == "Deployment"
+        }
+        return self
+
+    def _load_kind(self, kind, list_fn):
+        return {obj.name: obj for obj in iter_pages(kind, list_fn, self.namespace, page_size=self.page_size)}
+
+    async def pod_pages(self):
+        """Yields the namespace's pods one apiserver page (a list of records) at a time."""
+        token = None
+        while True:
+            records, token = await run_k8s(
+                list_page, "pods", self._list_functions["pods"], self.namespace,
+                page_size=self.page_size, token=token,
+            )
+            yield records
+            if not token:
+                return
+
+    def workload_of(self, pod):
+        """UID of the loaded Deployment or StatefulSet that owns `pod` (through its ReplicaSet), or None."""
+        for ref in pod.owner_references:
+            uid = self._replicaset_owners.get(ref.uid) if ref.kind == "ReplicaSet" else ref.uid
+            if uid in self._workload_uids:
+                return uid
+        return None
+
+    def list(self, kind):
+        return list(self._stores[kind].values())
+
+    def select(self, kind, selector):
+        store = self._stores[kind]
+        return [store[name] for name in sorted(self._indexes[kind].select(selector))]
+
+    def owner_graph(self):
+        return self._owners
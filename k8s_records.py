@@ -0,0 +1,126 @@
+# k8s_records.py
+
+"""
+Lean object layer for the topology and logs paths. List and watch calls are
+made with `_preload_content=False`, the raw JSON is parsed once, and only the
+handful of fields we read is copied into compact `__slots__` records instead
+of deep `V1Pod`/`V1Deployment` model graphs.
+"""
+
+import json
+from kubernetes.client.rest import ApiException
+
+
+def iso_timestamp(value):
+    # The apiserver always sends RFC 3339 UTC ("...Z"); match datetime.isoformat()
+    if value and value.endswith("Z"):
+        return value[:-1] + "+00:00"
+    return value
+
+
+class OwnerRef:
+    __slots__ = ("kind", "name", "uid", "controller")
+
+    def __init__(self, raw):
+        self.kind = raw.get("kind")
+        self.name = raw.get("name")
+        self.uid = raw.get("uid")
+        self.controller = raw.get("controller", False)
+
+
+class ObjectRecord:
+    """Metadata shared by every kind; on its own it is the record for ReplicaSets, Jobs and CronJobs."""
+
+    __slots__ = ("name", "namespace", "uid", "resource_version", "labels", "owner_references", "created_at")
+
+    def __init__(self, raw):
+        meta = raw.get("metadata") or {}
+        self.name = meta.get("name")
+        self.namespace = meta.get("namespace")
+        self.uid = meta.get("uid")
+        self.resource_version = meta.get("resourceVersion")
+        self.labels = meta.get("labels") or {}
+        self.owner_references = [OwnerRef(ref) for ref in meta.get("ownerReferences") or []]
+        self.created_at = iso_timestamp(meta.get("creationTimestamp"))
+
+
+def _first_container(pod_spec):
+    containers = (pod_spec or {}).get("containers") or []
+    return containers[0] if containers else {}
+
+
+class PodRecord(ObjectRecord):
+    __slots__ = ("phase", "pvcs", "image", "container_ports")
+
+    def __init__(self, raw):
+        super().__init__(raw)
+        spec = raw.get("spec") or {}
+        container = _first_container(spec)
+        self.phase = (raw.get("status") or {}).get("phase")
+        self.pvcs = [
+            vol["persistentVolumeClaim"]["claimName"]
+            for vol in spec.get("volumes") or []
+            if vol.get("persistentVolumeClaim")
+        ]
+        self.image = container.get("image")
+        self.container_ports = [p.get("containerPort") for p in container.get("ports") or []]
+
+
+class WorkloadRecord(ObjectRecord):
+    """Deployments and StatefulSets."""
+
+    __slots__ = ("selector", "replicas", "ready_replicas", "image", "container_ports")
+
+    def __init__(self, raw):
+        super().__init__(raw)
+        spec = raw.get("spec") or {}
+        container = _first_container(((spec.get("template") or {}).get("spec")))
+        self.selector = spec.get("selector") or {}
+        self.replicas = spec.get("replicas", 1)
+        self.ready_replicas = (raw.get("status") or {}).get("readyReplicas")
+        self.image = container.get("image")
+        self.container_ports = [p.get("containerPort") for p in container.get("ports") or []]
+
+
+class ServiceRecord(ObjectRecord):
+    __slots__ = ("selector", "cluster_ip", "ports")
+
+    def __init__(self, raw):
+        super().__init__(raw)
+        spec = raw.get("spec") or {}
+        self.selector = spec.get("selector") or {}
+        self.cluster_ip = spec.get("clusterIP") or ""
+        self.ports = [(p.get("port"), p.get("protocol", "TCP")) for p in spec.get("ports") or []]
+
+
+RECORD_TYPES = {
+    "pods": PodRecord,
+    "services": ServiceRecord,
+    "deployments": WorkloadRecord,
+    "statefulsets": WorkloadRecord,
+    "replicasets": ObjectRecord,
+    "jobs": ObjectRecord,
+    "cronjobs": ObjectRecord,
+}
+
+
+def read_json(response):
+    # With _preload_content=False the client hands back the raw urllib3 response unchecked
+    try:
+        if not 200 <= response.status <= 299:
+            raise ApiException(status=response.status, reason=response.reason)
+        return json.loads(response.data)
+    finally:
+        response.release_conn()
+
+
+def list_records(kind, list_fn, *args, **kwargs):
+    """
+    Calls a kubernetes list function without model deserialization.
+    Returns (records, resourceVersion, continue token).
+    """
+    record_type = RECORD_TYPES[kind]
+    body = read_json(list_fn(*args, _preload_content=False, **kwargs))
+    meta = body.get("metadata") or {}
+    records = [record_type(item) for item in body.get("items") or []]
+    return records, meta.get("resourceVersion"), meta.get("continue")
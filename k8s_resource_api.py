@@ -1,13 +1,25 @@
-from quart import Blueprint, request, jsonify, websocket
-from kubernetes import client, config, watch
+from quart import Blueprint, request, jsonify, websocket, make_response
 from kubernetes.client.rest import ApiException
 from dotenv import load_dotenv
+import asyncio
 import traceback
+from collections import Counter
 import json
-import re
-import os
 
-from embedding_utils import embed_classify  
+from embedding_utils import embed_classify_batch, is_ready as embedding_ready, warm_up_in_background, model_status
+from inference_worker import ClassificationWorker
+from k8s_informer import get_informer
+from k8s_async import cluster_api_client
+from k8s_paged_source import PagedNamespaceSource
+from label_index import LabelIndex
+from resource_hub import ResourceHub
+from resource_query import ResourceQuery, DEFAULT_QUERY
+from resource_serializer import pod_fields, top_level_node
+from service_classifier import classify_by_rules, classification_tiers, tier_counts
+from single_flight import SingleFlight, single_flight_stats
+from topology_snapshots import SnapshotStore
+from classification_cache import pod_base_name
+from config import Config
 
 load_dotenv()
 
@@ -15,12 +27,55 @@ resource_api = Blueprint('resource_api', __name__)
 
 VALID_TYPES = ["API", "DB", "Cache", "Frontend", "Worker", "Proxy"]
 
+# Model inference runs on its own thread, micro-batched across concurrent topology builds
+classifier = ClassificationWorker(embed_classify_batch)
+
 async def ai_infer_service_type(name, ports, image=None):
+    return (await ai_infer_service_types([(name, ports, image)]))[0]
+
+async def ai_infer_service_types(items, tiers=None):
+    """
+    Batch form of ai_infer_service_type for `(name, ports, image)` items.
+    Well-known ports, images and confident name rules answer first; only
+    the rest reach the embedding model. This call's per-tier hits are added
+    to `tiers` and to the global classification_tiers.
+    """
+    counts = Counter()
+    types = [None] * len(items)
+    ambiguous = []
+    for i, (name, ports, image) in enumerate(items):
+        tier, resource_type = classify_by_rules(name, ports, image)
+        if resource_type:
+            types[i] = resource_type
+            counts[tier] += 1
+        else:
+            ambiguous.append(i)
+
+    if ambiguous:
+        guessed = await infer_with_model([items[i] for i in ambiguous], counts)
+        for i, resource_type in zip(ambiguous, guessed):
+            types[i] = resource_type
+
+    # `tiers` may be a running total across batches; only this call's hits go into the global counter
+    if tiers is not None:
+        tiers.update(counts)
+    classification_tiers.update(counts)
+    return types
+
+async def infer_with_model(items, tiers):
+    # Until the embedding model has loaded in the background, classify by name
+    if not embedding_ready():
+        warm_up_in_background()
+        tiers["fallback"] += len(items)
+        return [guess_type_from_name(name) for name, _, _ in items]
     try:
-        return embed_classify(name, image)
+        types = await classifier.classify([(name, image) for name, _, image in items])
+        tiers["embedding"] += len(items)
+        return types
     except Exception as e:
         print("[Fallback Exception]", e)
-        return guess_type_from_name(name)
+        tiers["fallback"] += len(items)
+        return [guess_type_from_name(name) for name, _, _ in items]
 
 def guess_type_from_name(name):
     name = name.lower()
@@ -36,6 +91,253 @@ def guess_type_from_name(name):
         return "Worker"
     return "Unknown"
 
+def service_classification_input(svc, workloads):
+    """`(name, ports, image)` for a Service: its own ports plus what its selected workloads expose and run."""
+    ports = [f"{port}/{protocol}" for port, protocol in svc.ports]
+    ports += [port for obj in workloads for port in obj.container_ports]
+    image = next((obj.image for obj in workloads if obj.image), None)
+    return svc.name, ports, image
+
+def classification_name(k8s_type, obj):
+    # Controller-made pods carry generated suffixes; bare pods keep the name someone gave them
+    if k8s_type == "Pod" and obj.owner_references:
+        return pod_base_name(obj.name)
+    return obj.name
+
+def unmatched_entry(query, obj, node):
+    # Status is known before classification, so filtered-out nodes are never classified
+    if query.admits_status(node["status"]):
+        return classification_name(node["k8s_type"], obj), obj.container_ports, obj.image, top_level_node, (node,)
+    return None
+
+def plan_environment_resources(source, query=DEFAULT_QUERY):
+    """
+    Matches Services to workloads and pods and yields one
+    `(name, ports, image, build, args)` entry per top-level node that passes
+    the query's kind/name filters; the node is `build(resource_type, *args)`
+    once its type is known. Classification is left to the caller so it can
+    be batched. `source` is a namespace informer or any object with the same
+    list/select/owner_graph interface over k8s_records records, plus a
+    `nodes` NodeSerializer that memoizes each object's node fields.
+    """
+    nodes = source.nodes
+    matched_pods = set()
+    matched_deployments = set()
+    matched_statefulsets = set()
+    owners = source.owner_graph()
+
+    # Workload pods come from ownerReferences (Deployment -> ReplicaSet -> Pod)
+    def workload_pods(k8s_type, obj):
+        pods = owners.pods_of(k8s_type, obj.name)
+        matched_pods.update(pod.name for pod in pods)
+        return pods
+
+    # Services
+    for svc in source.list("services"):
+        selector = svc.selector
+
+        # Matching runs even for filtered-out services so their workloads are not reported as unmatched
+        deployments = [(dep, workload_pods("Deployment", dep)) for dep in source.select("deployments", selector)]
+        matched_deployments.update(dep.name for dep, _ in deployments)
+
+        statefulsets = [(sts, workload_pods("StatefulSet", sts)) for sts in source.select("statefulsets", selector)]
+        matched_statefulsets.update(sts.name for sts, _ in statefulsets)
+
+        # Match loose pods
+        loose_pods = [pod for pod in source.select("pods", selector) if pod.name not in matched_pods]
+        matched_pods.update(pod.name for pod in loose_pods)
+
+        if not query.admits("Service", svc.name):
+            continue
+
+        associated = (
+            [nodes.workload_node("Deployment", dep, pods) for dep, pods in deployments]
+            + [nodes.workload_node("StatefulSet", sts, pods) for sts, pods in statefulsets]
+            + [nodes.pod_node(pod) for pod in loose_pods]
+        )
+        workloads = [dep for dep, _ in deployments] + [sts for sts, _ in statefulsets]
+        yield (*service_classification_input(svc, workloads), nodes.service_node, (svc, associated))
+
+    def unmatched(obj, node):
+        return unmatched_entry(query, obj, node)
+
+    # Unmatched Deployments
+    for dep in source.list("deployments"):
+        if dep.name in matched_deployments:
+            continue
+        # Claim the pods even when filtered out, so they are not reported as loose pods
+        pods = workload_pods("Deployment", dep)
+        if query.admits("Deployment", dep.name):
+            entry = unmatched(dep, nodes.workload_node("Deployment", dep, pods))
+            if entry is not None:
+                yield entry
+
+    # Unmatched StatefulSets
+    for sts in source.list("statefulsets"):
+        if sts.name in matched_statefulsets:
+            continue
+        # Claim the pods even when filtered out, so they are not reported as loose pods
+        pods = workload_pods("StatefulSet", sts)
+        if query.admits("StatefulSet", sts.name):
+            entry = unmatched(sts, nodes.workload_node("StatefulSet", sts, pods))
+            if entry is not None:
+                yield entry
+
+    # Unmatched Pods
+    for pod in source.list("pods"):
+        if pod.name not in matched_pods and query.admits("Pod", pod.name):
+            entry = unmatched(pod, nodes.pod_node(pod))
+            if entry is not None:
+                yield entry
+
+async def classify_in_batches(entries, query=DEFAULT_QUERY, tiers=None):
+    """
+    Classifies planned `(name, ports, image, build, args)` entries
+    CLASSIFY_BATCH_SIZE at a time and yields the built nodes that pass the
+    query's type/status filters, unprojected and in order.
+    """
+    batch = []
+
+    async def finish(batch):
+        types = await ai_infer_service_types([(name, ports, image) for name, ports, image, _, _ in batch], tiers)
+        finished = []
+        for resource_type, (_, _, _, build, args) in zip(types, batch):
+            node = build(resource_type, *args)
+            if query.admits_type(resource_type) and query.admits_status(node["status"]):
+                finished.append(node)
+        return finished
+
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= Config.CLASSIFY_BATCH_SIZE:
+            for node in await finish(batch):
+                yield node
+            batch = []
+
+    if batch:
+        for node in await finish(batch):
+            yield node
+
+async def iter_environment_resources(source, query=DEFAULT_QUERY, tiers=None):
+    """
+    Yields the top-level Service -> workload -> Pod topology nodes in order.
+    `query` filters top-level nodes and projects the ones that are yielded;
+    classifier tier hits are counted into `tiers` when given.
+    """
+    async for node in classify_in_batches(plan_environment_resources(source, query), query, tiers):
+        yield query.project(node)
+
+async def build_environment_resources(source, query=DEFAULT_QUERY, tiers=None):
+    """Builds the full topology list from an informer's cached objects."""
+    return [node async for node in iter_environment_resources(source, query, tiers)]
+
+async def build_with_tiers(source, query=DEFAULT_QUERY):
+    """(resources, per-tier classification counts) for one build."""
+    tiers = Counter()
+    resources = await build_environment_resources(source, query, tiers)
+    return resources, tier_counts(tiers)
+
+async def iter_streamed_resources(source, query=DEFAULT_QUERY):
+    """
+    Topology for a PagedNamespaceSource, produced while its pods are still
+    being paged in. Services and unmatched workloads come first, their
+    workloads nested without pods; then each page of pods, every pod either
+    as a child line `{..., "parent": <uid>}` of an already emitted node or,
+    when nothing claims it, as a classified top-level node. Only the
+    controllers and one page of pods are held at a time.
+
+    Child lines follow the query like nested pods do in the JSON response:
+    none when `fields` leaves out `associated` or `depth` cuts them off.
+    Nodes they attach to keep their `uid` even when `fields` leaves it out.
+    """
+    await source.load()
+
+    # uid -> depth of every emitted node a pod can hang under
+    placed = {}
+    services = source.list("services")
+    nests_pods = query.keeps("associated") and query.depth != 0
+    parent_query = query.keeping("uid") if nests_pods else query
+
+    async for node in classify_in_batches(plan_environment_resources(source, query), query):
+        placed[node["uid"]] = 0
+        for child in node["associated"]:
+            placed[child["uid"]] = 1
+        yield parent_query.project(node)
+
+    async for pods in source.pod_pages():
+        parents = {}
+        loose = LabelIndex()
+        for pod in pods:
+            owner = source.workload_of(pod)
+            if owner is not None:
+                # Claimed by its workload even when that workload was filtered out
+                parents[pod.name] = owner
+            else:
+                loose.add(pod.name, pod.labels)
+
+        # A pod no workload owns belongs to the first Service selecting it
+        for svc in services:
+            for name in sorted(loose.select(svc.selector)):
+                parents[name] = svc.uid
+                loose.remove(name)
+
+        unclaimed = []
+        for pod in pods:
+            parent = parents.get(pod.name)
+            node = pod_fields(pod)
+            if parent is None:
+                if query.admits("Pod", pod.name):
+                    entry = unmatched_entry(query, pod, node)
+                    if entry is not None:
+                        unclaimed.append(entry)
+            elif nests_pods and parent in placed and (query.depth is None or placed[parent] < query.depth):
+                yield {**query.project(node), "parent": parent}
+
+        async for node in classify_in_batches(unclaimed, query):
+            yield query.project(node)
+
+async def stream_environment_resources(source, query=DEFAULT_QUERY):
+    """NDJSON body: one resource per line, flushed as soon as it is assembled."""
+    try:
+        async for node in iter_streamed_resources(source, query):
+            yield json.dumps(node) + "\n"
+    except ApiException as e:
+        yield json.dumps({"error": f"Kubernetes API error: {e.reason}"}) + "\n"
+    except Exception as e:
+        print("Exception:", traceback.format_exc())
+        yield json.dumps({"error": str(e)}) + "\n"
+
+resource_hub = ResourceHub(build_environment_resources)
+resources_flight = SingleFlight("environment_resources")
+snapshot_flight = SingleFlight("snapshot_refresh")
+snapshots = SnapshotStore()
+_background_tasks = set()
+
+def run_in_background(coro, label):
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+
+    def done(t):
+        _background_tasks.discard(t)
+        if not t.cancelled() and t.exception() is not None:
+            print(f"[Snapshots] {label} failed: {t.exception()}")
+
+    task.add_done_callback(done)
+
+def topology_etag(informer, query=DEFAULT_QUERY):
+    etag = query.etag(informer.version_token())
+    if not embedding_ready():
+        # Name-based types will change once the model is up; never let them be revalidated as current
+        etag += "-byname"
+    return etag
+
+async def refresh_snapshot(env_name, informer):
+    """Rebuilds an environment's topology once its informer has synced and persists it."""
+    await asyncio.to_thread(informer.wait_until_synced, Config.INFORMER_SYNC_TIMEOUT)
+    etag = topology_etag(informer)
+    resources, _ = await resources_flight.do((env_name, etag), lambda: build_with_tiers(informer))
+    await snapshots.save(env_name, etag, resources)
+
 @resource_api.route("/api/environment-resources", methods=["GET"])
 async def get_environment_resources():
     env_name = request.args.get("env_name")
@@ -44,188 +346,104 @@ async def get_environment_resources():
         return jsonify({"error": "Environment name is required"}), 400
 
     try:
-        try:
-            config.load_incluster_config()
-        except:
-            config.load_kube_config()
-
-        core_v1 = client.CoreV1Api()
-        apps_v1 = client.AppsV1Api()
-
-        resources = []
-        matched_pods = set()
-        matched_deployments = set()
-        matched_statefulsets = set()
-
-        # Pre-fetch everything
-        all_pods = core_v1.list_namespaced_pod(env_name).items
-        all_deployments = apps_v1.list_namespaced_deployment(env_name).items
-        all_statefulsets = apps_v1.list_namespaced_stateful_set(env_name).items
-
-        pod_map = {pod.metadata.name: pod for pod in all_pods}
-
-        # Helper: Get pods matching a label selector
-        def match_pods(selector):
-            if not selector:
-                return []
-            label_selector = ",".join(f"{k}={v}" for k, v in selector.items())
-            return core_v1.list_namespaced_pod(env_name, label_selector=label_selector).items
-
-        # Services
-        services = core_v1.list_namespaced_service(env_name).items
-        for svc in services:
-            selector = svc.spec.selector or {}
-            ports = [f"{p.port}/{p.protocol}" for p in svc.spec.ports or []]
-            associated = []
-
-            # Match deployments
-            deployments = apps_v1.list_namespaced_deployment(env_name, label_selector=",".join(f"{k}={v}" for k, v in selector.items())).items
-            for dep in deployments:
-                matched_deployments.add(dep.metadata.name)
-                dep_pods = match_pods(dep.spec.selector.match_labels)
-                for pod in dep_pods:
-                    matched_pods.add(pod.metadata.name)
-
-                associated.append({
-                    "k8s_type": "Deployment",
-                    "name": dep.metadata.name,
-                    "status": "Available" if dep.status.ready_replicas else "Pending",
-                    "created_at": dep.metadata.creation_timestamp.isoformat(),
-                    "pvcs": [],
-                    "associated": [{
-                        "k8s_type": "Pod",
-                        "name": pod.metadata.name,
-                        "status": pod.status.phase,
-                        "created_at": pod.metadata.creation_timestamp.isoformat(),
-                        "pvcs": [vol.persistent_volume_claim.claim_name for vol in (pod.spec.volumes or []) if vol.persistent_volume_claim],
-                    } for pod in dep_pods]
-                })
-
-            # Match statefulsets
-            statefulsets = apps_v1.list_namespaced_stateful_set(env_name, label_selector=",".join(f"{k}={v}" for k, v in selector.items())).items
-            for sts in statefulsets:
-                matched_statefulsets.add(sts.metadata.name)
-                sts_pods = match_pods(sts.spec.selector.match_labels)
-                for pod in sts_pods:
-                    matched_pods.add(pod.metadata.name)
-
-                associated.append({
-                    "k8s_type": "StatefulSet",
-                    "name": sts.metadata.name,
-                    "status": "Available" if sts.status.ready_replicas else "Pending",
-                    "created_at": sts.metadata.creation_timestamp.isoformat(),
-                    "pvcs": [],
-                    "associated": [{
-                        "k8s_type": "Pod",
-                        "name": pod.metadata.name,
-                        "status": pod.status.phase,
-                        "created_at": pod.metadata.creation_timestamp.isoformat(),
-                        "pvcs": [vol.persistent_volume_claim.claim_name for vol in (pod.spec.volumes or []) if vol.persistent_volume_claim],
-                    } for pod in sts_pods]
-                })
-
-            # Match loose pods
-            pods = match_pods(selector)
-            for pod in pods:
-                if pod.metadata.name not in matched_pods:
-                    matched_pods.add(pod.metadata.name)
-                    associated.append({
-                        "k8s_type": "Pod",
-                        "name": pod.metadata.name,
-                        "status": pod.status.phase,
-                        "created_at": pod.metadata.creation_timestamp.isoformat(),
-                        "pvcs": [vol.persistent_volume_claim.claim_name for vol in (pod.spec.volumes or []) if vol.persistent_volume_claim],
+        query = ResourceQuery.from_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        api_client = await cluster_api_client()
+
+        # Opt-in streaming for huge namespaces: paged lists, no informer, one resource per line.
+        # Listing happens inside the body generator, so the response starts right away.
+        if request.args.get("format") == "ndjson":
+            source = PagedNamespaceSource(env_name, api_client)
+            return stream_environment_resources(source, query), 200, {"Content-Type": "application/x-ndjson"}
+
+        # Namespace informer lists once, then keeps its copy current from watches
+        informer = get_informer(env_name, api_client)
+
+        # Cold start: answer from the persisted snapshot, marked stale, while the informer syncs
+        if query.is_default() and not informer.is_synced():
+            snapshot = await snapshots.load(env_name)
+            if snapshot is not None:
+                run_in_background(
+                    snapshot_flight.do(env_name, lambda: refresh_snapshot(env_name, informer)),
+                    f"refresh of '{env_name}'"
+                )
+                # The snapshot keeps the validator it was built under, so a client already holding it gets a 304
+                version = snapshot.get("version")
+                if version and version in request.if_none_match:
+                    response = await make_response("", 304)
+                else:
+                    response = jsonify({
+                        "resources": snapshot["resources"],
+                        "stale": True,
+                        "snapshot_saved_at": snapshot["saved_at"],
                     })
+                if version:
+                    response.set_etag(version)
+                return response
+
+        await asyncio.to_thread(informer.wait_until_synced, Config.INFORMER_SYNC_TIMEOUT)
 
-            service_type = await ai_infer_service_type(svc.metadata.name, ports)
-
-            resources.append({
-                "type": service_type,
-                "k8s_type": "Service",
-                "name": svc.metadata.name,
-                "status": "Active",
-                "created_at": svc.metadata.creation_timestamp.isoformat(),
-                "pvcs": [],
-                "cluster_ip": svc.spec.cluster_ip or "",
-                "ports": ports,
-                "associated": associated
-            })
-
-        # Unmatched Deployments
-        for dep in all_deployments:
-            if dep.metadata.name not in matched_deployments:
-                dep_pods = match_pods(dep.spec.selector.match_labels)
-                for pod in dep_pods:
-                    matched_pods.add(pod.metadata.name)
-                image = dep.spec.template.spec.containers[0].image if dep.spec.template.spec.containers else None
-                dep_type = await ai_infer_service_type(dep.metadata.name, [], image)
-
-                resources.append({
-                    "type": dep_type,
-                    "k8s_type": "Deployment",
-                    "name": dep.metadata.name,
-                    "status": "Available" if dep.status.ready_replicas else "Pending",
-                    "created_at": dep.metadata.creation_timestamp.isoformat(),
-                    "pvcs": [],
-                    "cluster_ip": "",
-                    "ports": [],
-                    "associated": [{
-                        "k8s_type": "Pod",
-                        "name": pod.metadata.name,
-                        "status": pod.status.phase,
-                        "created_at": pod.metadata.creation_timestamp.isoformat(),
-                        "pvcs": [vol.persistent_volume_claim.claim_name for vol in (pod.spec.volumes or []) if vol.persistent_volume_claim],
-                    } for pod in dep_pods]
-                })
-
-        # Unmatched StatefulSets
-        for sts in all_statefulsets:
-            if sts.metadata.name not in matched_statefulsets:
-                sts_pods = match_pods(sts.spec.selector.match_labels)
-                for pod in sts_pods:
-                    matched_pods.add(pod.metadata.name)
-                image = sts.spec.template.spec.containers[0].image if sts.spec.template.spec.containers else None
-                sts_type = await ai_infer_service_type(sts.metadata.name, [], image)
-
-                resources.append({
-                    "type": sts_type,
-                    "k8s_type": "StatefulSet",
-                    "name": sts.metadata.name,
-                    "status": "Available" if sts.status.ready_replicas else "Pending",
-                    "created_at": sts.metadata.creation_timestamp.isoformat(),
-                    "pvcs": [],
-                    "cluster_ip": "",
-                    "ports": [],
-                    "associated": [{
-                        "k8s_type": "Pod",
-                        "name": pod.metadata.name,
-                        "status": pod.status.phase,
-                        "created_at": pod.metadata.creation_timestamp.isoformat(),
-                        "pvcs": [vol.persistent_volume_claim.claim_name for vol in (pod.spec.volumes or []) if vol.persistent_volume_claim],
-                    } for pod in sts_pods]
-                })
-
-        # Unmatched Pods
-        for pod in all_pods:
-            if pod.metadata.name not in matched_pods:
-                image = pod.spec.containers[0].image if pod.spec.containers else None
-                pod_type = await ai_infer_service_type(pod.metadata.name, [], image)
-                resources.append({
-                    "type": pod_type,
-                    "k8s_type": "Pod",
-                    "name": pod.metadata.name,
-                    "status": pod.status.phase,
-                    "created_at": pod.metadata.creation_timestamp.isoformat(),
-                    "pvcs": [vol.persistent_volume_claim.claim_name for vol in (pod.spec.volumes or []) if vol.persistent_volume_claim],
-                    "cluster_ip": "",
-                    "ports": [],
-                    "associated": []
-                })
-
-        return jsonify({"resources": resources})
+        # Conditional GET: skip the build entirely when nothing in the namespace changed
+        etag = topology_etag(informer, query)
+        if etag in request.if_none_match:
+            response = await make_response("", 304)
+            response.set_etag(etag)
+            return response
+
+        # Concurrent requests for the same namespace state share one build
+        resources, tiers = await resources_flight.do((env_name, etag), lambda: build_with_tiers(informer, query))
+
+        if query.is_default() and snapshots.due(env_name, etag):
+            run_in_background(snapshots.save(env_name, etag, resources), f"save of '{env_name}'")
+
+        response = jsonify({"resources": resources, "classification_tiers": tiers})
+        response.set_etag(etag)
+        return response
 
     except ApiException as e:
         return jsonify({"error": f"Kubernetes API error: {e.reason}"}), 500
+    except TimeoutError as e:
+        return jsonify({"error": str(e)}), 504
     except Exception as e:
         print("Exception:", traceback.format_exc())
-        return jsonify({"error": str(e)})
\ No newline at end of file
+        return jsonify({"error": str(e)})
+
+@resource_api.route("/api/metrics", methods=["GET"])
+async def get_metrics():
+    return jsonify({
+        "single_flight": single_flight_stats(),
+        "websocket_subscribers": resource_hub.stats(),
+        "embedding_model": model_status(),
+        "classifier_worker": classifier.stats(),
+        "classification_tiers": tier_counts(classification_tiers),
+    })
+
+@resource_api.websocket("/ws/resources")
+async def ws_resource_updates():
+    env_name = websocket.args.get("env_name")
+    if not env_name:
+        await websocket.send(json.dumps({"error": "Missing env_name"}))
+        return
+
+    try:
+        api_client = await cluster_api_client()
+
+        # One shared informer listener and rebuild per namespace, fanned out to every client
+        sub = await resource_hub.subscribe(env_name, api_client)
+        try:
+            while True:
+                message = await sub.get()
+                await websocket.send(json.dumps(message))
+                if message["type"] == "dropped":
+                    break
+        finally:
+            await resource_hub.unsubscribe(sub)
+
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print("[WebSocket Error]", traceback.format_exc())
+        await websocket.send(json.dumps({"error": str(e)}))
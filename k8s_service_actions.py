@@ -3,6 +3,7 @@
 from quart import Blueprint, request, jsonify
 from kubernetes import client
 from auth_loader import load_k8s_auth
+from k8s_async import run_k8s
 import datetime
 
 service_actions = Blueprint("service_actions", __name__)
@@ -18,11 +19,12 @@ async def start_service():
         return jsonify({"error": "Missing envName or serviceName"}), 400
 
     try:
-        await load_k8s_auth(env_name)  # Await this correctly
-        apps_v1 = client.AppsV1Api()
+        api_client = await load_k8s_auth(env_name)  # Await this correctly
+        apps_v1 = client.AppsV1Api(api_client)
         print(f"🚀 Scaling deployment {service_name} in namespace {env_name}")
         
-        response = apps_v1.patch_namespaced_deployment_scale(
+        response = await run_k8s(
+            apps_v1.patch_namespaced_deployment_scale,
             name=service_name,
             namespace=env_name,
             body={"spec": {"replicas": 1}},
@@ -50,10 +52,10 @@ async def stop_service():
         return jsonify({"error": "Missing envName or serviceName"}), 400
 
     try:
-        await load_k8s_auth(env_name)
-        apps_v1 = client.AppsV1Api()
+        api_client = await load_k8s_auth(env_name)
+        apps_v1 = client.AppsV1Api(api_client)
         body = {"spec": {"replicas": 0}}
-        apps_v1.patch_namespaced_deployment_scale(service_name, env_name, body)
+        await run_k8s(apps_v1.patch_namespaced_deployment_scale, service_name, env_name, body)
         return jsonify({"message": f"🛑 {service_name} scaled to 0 in {env_name}"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -69,8 +71,8 @@ async def redeploy_service():
         return jsonify({"error": "Missing envName or serviceName"}), 400
 
     try:
-        await load_k8s_auth(env_name)
-        apps_v1 = client.AppsV1Api()
+        api_client = await load_k8s_auth(env_name)
+        apps_v1 = client.AppsV1Api(api_client)
         now = datetime.datetime.utcnow().isoformat("T") + "Z"
 
         body = {
@@ -84,7 +86,7 @@ async def redeploy_service():
                 }
             }
         }
-        apps_v1.patch_namespaced_deployment(service_name, env_name, body)
+        await run_k8s(apps_v1.patch_namespaced_deployment, service_name, env_name, body)
         return jsonify({"message": f"🔁 {service_name} re-deployed in {env_name}"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
\ No newline at end of file
@@ -0,0 +1,90 @@
+# label_index.py
+
+import threading
+from collections import defaultdict
+from label_selector import parse_selector
+
+
+class LabelIndex:
+    """
+    Inverted index from `key=value` (and bare `key`) to object names, so a
+    selector resolves to a set intersection instead of a scan over every
+    object. Updated incrementally with add/remove as objects change.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._labels = {}
+        self._by_pair = defaultdict(set)
+        self._by_key = defaultdict(set)
+
+    def __len__(self):
+        return len(self._labels)
+
+    def add(self, name, labels):
+        with self._lock:
+            self._remove(name)
+            labels = dict(labels or {})
+            self._labels[name] = labels
+            for key, value in labels.items():
+                self._by_pair[(key, value)].add(name)
+                self._by_key[key].add(name)
+
+    def remove(self, name):
+        with self._lock:
+            self._remove(name)
+
+    def clear(self):
+        with self._lock:
+            self._labels.clear()
+            self._by_pair.clear()
+            self._by_key.clear()
+
+    def select(self, selector):
+        """Returns the set of names whose labels satisfy `selector`."""
+        requirements = parse_selector(selector)
+        if requirements is None:
+            return set()
+
+        with self._lock:
+            positive = []
+            negative = []
+            for key, operator, values in requirements:
+                if operator == "In":
+                    positive.append(set().union(*(self._by_pair.get((key, v), ()) for v in values)))
+                elif operator == "Exists":
+                    positive.append(self._by_key.get(key, set()))
+                elif operator == "NotIn":
+                    negative.append(set().union(*(self._by_pair.get((key, v), ()) for v in values)))
+                else:
+                    negative.append(self._by_key.get(key, set()))
+
+            if positive:
+                positive.sort(key=len)
+                names = set(positive[0])
+                for candidates in positive[1:]:
+                    names &= candidates
+                    if not names:
+                        break
+            else:
+                names = set(self._labels)
+
+            for excluded in negative:
+                names -= excluded
+            return names
+
+    def _remove(self, name):
+        labels = self._labels.pop(name, None)
+        if not labels:
+            return
+        for key, value in labels.items():
+            self._discard(self._by_pair, (key, value), name)
+            self._discard(self._by_key, key, name)
+
+    @staticmethod
+    def _discard(index, key, name):
+        names = index.get(key)
+        if names is not None:
+            names.discard(name)
+            if not names:
+                del index[key]
@@ -0,0 +1,71 @@
+# label_selector.py
+
+"""
+Local evaluation of Kubernetes label selectors, so objects that are already
+in memory can be matched without asking the apiserver to filter them.
+"""
+
+
+def _field(obj, attr, key):
+    # Selectors arrive either as kubernetes client models or as raw JSON dicts.
+    if isinstance(obj, dict):
+        return obj.get(key)
+    return getattr(obj, attr, None)
+
+
+def parse_selector(selector):
+    """
+    Normalizes a selector into a list of (key, operator, values) requirements.
+
+    Accepts a Service-style `{key: value}` map, a `V1LabelSelector`, or the raw
+    JSON form with `matchLabels` / `matchExpressions`. Returns None when the
+    selector selects nothing (a missing or empty Service selector) and an
+    empty list when it selects everything (an empty LabelSelector).
+    """
+    if selector is None:
+        return None
+
+    is_label_selector = not isinstance(selector, dict) or "matchLabels" in selector or "matchExpressions" in selector
+    if not is_label_selector:
+        if not selector:
+            return None
+        return [(key, "In", [value]) for key, value in selector.items()]
+
+    requirements = []
+    for key, value in (_field(selector, "match_labels", "matchLabels") or {}).items():
+        requirements.append((key, "In", [value]))
+    for expr in _field(selector, "match_expressions", "matchExpressions") or []:
+        operator = _field(expr, "operator", "operator")
+        if operator not in ("In", "NotIn", "Exists", "DoesNotExist"):
+            raise ValueError(f"Unsupported label selector operator: {operator}")
+        requirements.append((_field(expr, "key", "key"), operator, list(_field(expr, "values", "values") or [])))
+    return requirements
+
+
+def requirement_matches(key, operator, values, labels):
+    if operator == "In":
+        return key in labels and labels[key] in values
+    if operator == "NotIn":
+        return key not in labels or labels[key] not in values
+    if operator == "Exists":
+        return key in labels
+    return key not in labels
+
+
+def labels_match(requirements, labels):
+    if requirements is None:
+        return False
+    labels = labels or {}
+    return all(requirement_matches(key, op, values, labels) for key, op, values in requirements)
+
+
+def select(selector, objects, labels_of=lambda obj: obj.labels):
+    """
+    Returns the objects (k8s_records records by default) whose labels
+    satisfy `selector`. A plain scan: the reference behaviour LabelIndex
+    must reproduce.
+    """
+    requirements = parse_selector(selector)
+    if requirements is None:
+        return []
+    return [obj for obj in objects if labels_match(requirements, labels_of(obj))]
@@ -1,9 +1,52 @@
-from kubernetes import config, client
+import asyncio
+from kubernetes import client
 from auth_loader import load_k8s_auth
 from quart import Blueprint, request, jsonify
+from k8s_informer import informer_list_functions
+from k8s_async import run_k8s
+from k8s_paged_source import iter_pages
+from owner_graph import OwnerGraph
+from single_flight import SingleFlight
+from config import Config
 
 logs_api = Blueprint("logs_api", __name__)
 
+logs_flight = SingleFlight("logs")
+
+# Pods plus the intermediate owners between them and a controller; the
+# controllers themselves are known by the names in those ownerReferences
+LOG_OWNER_KINDS = ("pods", "replicasets", "jobs")
+
+def list_kind(kind, list_fn, env_name):
+    return list(iter_pages(kind, list_fn, env_name, page_size=Config.STREAM_PAGE_SIZE))
+
+async def load_owner_graph(env_name, list_functions):
+    """Owner graph over a fresh list of the namespace's pods, ReplicaSets and Jobs, one paged list per kind."""
+    lists = await asyncio.gather(*(run_k8s(list_kind, kind, list_functions[kind], env_name) for kind in LOG_OWNER_KINDS))
+    return OwnerGraph.build(dict(zip(LOG_OWNER_KINDS, lists)))
+
+async def collect_controller_logs(env_name, controller_name, core_v1, list_functions):
+    """Tail of every pod's log for a controller; an empty list when it has no pods."""
+    # Walk ownerReferences (Deployment -> ReplicaSet -> Pod, CronJob -> Job -> Pod, ...)
+    owners = await load_owner_graph(env_name, list_functions)
+    matching_pods = [pod.name for pod in owners.pods_owned_by_name(controller_name)]
+
+    async def fetch_log(pod_name):
+        try:
+            log = await run_k8s(
+                core_v1.read_namespaced_pod_log,
+                name=pod_name,
+                namespace=env_name,
+                tail_lines=100,
+                timestamps=True
+            )
+            return f"\n◆ Deployment Pod: {pod_name}\n" + log
+        except Exception as e:
+            return f"\n❌ Failed to get logs from {pod_name}: {str(e)}"
+
+    # Pod logs are independent, so fetch them concurrently (order is preserved)
+    return await asyncio.gather(*(fetch_log(pod_name) for pod_name in matching_pods))
+
 @logs_api.route("/api/logs", methods=["GET"])
 async def get_filtered_logs():
     env_name = request.args.get("env_name")
@@ -13,38 +56,20 @@ async def get_filtered_logs():
         return jsonify({"error": "Missing env_name or controller_name"}), 400
 
     try:
-        await load_k8s_auth(env_name)
-        core_v1 = client.CoreV1Api()
-        apps_v1 = client.AppsV1Api()
-        batch_v1 = client.BatchV1Api()
-
-        pods = core_v1.list_namespaced_pod(namespace=env_name)
-        matching_pods = []
-
-        for pod in pods.items:
-            owner_refs = pod.metadata.owner_references
-            if owner_refs:
-                for ref in owner_refs:
-                    if ref.name == controller_name and ref.kind in ["Deployment", "StatefulSet", "ReplicaSet", "CronJob"]:
-                        matching_pods.append(pod.metadata.name)
-
-        if not matching_pods:
-            return jsonify({"message": f"No pods found for {controller_name}"}), 404
+        api_client = await load_k8s_auth(env_name)
+        # Pods are listed with the same environment credentials the logs are read with;
+        # the shared namespace informers run on the app's own cluster config
+        core_v1 = client.CoreV1Api(api_client)
+        list_functions = informer_list_functions(api_client)
 
-        all_logs = []
-
-        for pod_name in matching_pods:
-            try:
-                log = core_v1.read_namespaced_pod_log(
-                    name=pod_name,
-                    namespace=env_name,
-                    tail_lines=100,
-                    timestamps=True
-                )
-                log_block = f"\n◆ Deployment Pod: {pod_name}\n" + log
-                all_logs.append(log_block)
-            except Exception as e:
-                all_logs.append(f"\n❌ Failed to get logs from {pod_name}: {str(e)}")
+        # Concurrent requests for the same controller share one log fan-out
+        all_logs = await logs_flight.do(
+            (env_name, controller_name),
+            lambda: collect_controller_logs(env_name, controller_name, core_v1, list_functions)
+        )
+
+        if not all_logs:
+            return jsonify({"message": f"No pods found for {controller_name}"}), 404
 
         return "\n\n".join(all_logs)
 
@@ -0,0 +1,107 @@
+# owner_graph.py
+
+from collections import defaultdict
+
+# Informer kind -> Kubernetes Kind
+KIND_NAMES = {
+    "cronjobs": "CronJob",
+    "deployments": "Deployment",
+    "statefulsets": "StatefulSet",
+    "jobs": "Job",
+    "replicasets": "ReplicaSet",
+    "pods": "Pod",
+}
+
+CONTROLLER_KINDS = ["Deployment", "StatefulSet", "ReplicaSet", "CronJob", "Job"]
+
+
+class OwnerGraph:
+    """
+    Ownership graph built from `metadata.ownerReferences`, e.g.
+    Deployment -> ReplicaSet -> Pod or CronJob -> Job -> Pod. Lets callers
+    resolve every pod of a controller with one traversal over objects that
+    are already in memory.
+    """
+
+    def __init__(self):
+        self._objects = {}
+        self._kinds = {}
+        self._children = defaultdict(list)
+        self._by_name = defaultdict(list)
+
+    @classmethod
+    def build(cls, objects_by_kind):
+        """`objects_by_kind` maps informer kinds ("pods", "replicasets", ...) to object lists."""
+        graph = cls()
+        for kind, objects in objects_by_kind.items():
+            for obj in objects:
+                graph.add(KIND_NAMES[kind], obj)
+        return graph
+
+    def add(self, kind, obj):
+        self._objects[obj.uid] = obj
+        self._kinds[obj.uid] = kind
+        self._by_name[(kind, obj.name)].append(obj.uid)
+        for ref in obj.owner_references:
+            self._children[ref.uid].append(obj.uid)
+
+    def find(self, name, kinds=None):
+        """UIDs of objects called `name`, limited to `kinds` (defaults to controller kinds)."""
+        uids = []
+        for kind in kinds or CONTROLLER_KINDS:
+            uids.extend(self._by_name.get((kind, name), []))
+        return uids
+
+    def descendants(self, uid, kind=None):
+        """Every object transitively owned by `uid`, optionally only those of `kind`."""
+        found = []
+        stack = list(self._children.get(uid, []))
+        seen = set()
+        while stack:
+            child = stack.pop()
+            if child in seen:
+                continue
+            seen.add(child)
+            if kind is None or self._kinds.get(child) == kind:
+                if child in self._objects:
+                    found.append(self._objects[child])
+            stack.extend(self._children.get(child, []))
+        return found
+
+    def pods_of(self, kind, name):
+        """Pods owned, directly or through ReplicaSets/Jobs, by the `kind` called `name`."""
+        pods = []
+        for uid in self.find(name, [kind]):
+            pods.extend(self.descendants(uid, "Pod"))
+        return sorted(pods, key=lambda pod: pod.name)
+
+    def pods_owned_by_name(self, name, kinds=None):
+        """
+        Pods with an owner of `kinds` (defaults to controller kinds) called
+        `name` anywhere up their ownerReferences. References carry the
+        owner's name, so the graph only needs pods and their ReplicaSets and
+        Jobs; the Deployments, StatefulSets and CronJobs on top never have
+        to be listed.
+        """
+        kinds = kinds or CONTROLLER_KINDS
+
+        def owned(uid, seen):
+            obj = self._objects.get(uid)
+            if obj is None or uid in seen:
+                return False
+            seen.add(uid)
+            return any(
+                (ref.kind in kinds and ref.name == name) or owned(ref.uid, seen)
+                for ref in obj.owner_references
+            )
+
+        pods = [obj for uid, obj in self._objects.items() if self._kinds[uid] == "Pod" and owned(uid, set())]
+        return sorted(pods, key=lambda pod: pod.name)
+
+    def pods_of_controller(self, name):
+        """Pods of any controller kind called `name`, each pod listed once."""
+        pods = {}
+        for uid in self.find(name):
+            for pod in self.descendants(uid, "Pod"):
+                pods[pod.uid] = pod
+        return sorted(pods.values(), key=lambda pod: pod.name)
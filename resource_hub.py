@@ -0,0 +1,199 @@
+# resource_hub.py
+
+import asyncio
+from k8s_informer import informers
+from config import Config
+
+
+def flatten_resources(resources, parent=None, objects=None):
+    """
+    `{uid: node}` over every node of a topology tree, parents first. Each
+    node is stored without its `associated` children and with the uid of the
+    node it sits under (`parent`, None at the top level), so a change deep in
+    the tree patches only the object that changed.
+    """
+    objects = {} if objects is None else objects
+    for node in resources:
+        objects[node["uid"]] = {
+            **{key: value for key, value in node.items() if key != "associated"},
+            "parent": parent,
+        }
+        flatten_resources(node.get("associated", []), node["uid"], objects)
+    return objects
+
+
+def diff_resources(previous, latest):
+    """Add/update/delete patch between two flattened topology snapshots."""
+    return {
+        "added": [node for uid, node in latest.items() if uid not in previous],
+        "updated": [node for uid, node in latest.items() if uid in previous and previous[uid] != node],
+        "deleted": [uid for uid in previous if uid not in latest],
+    }
+
+
+class Subscription:
+    """One websocket client's bounded view of a namespace channel."""
+
+    def __init__(self, namespace, maxsize):
+        self.namespace = namespace
+        self.dropped = False
+        self._queue = asyncio.Queue(maxsize=maxsize)
+
+    def offer(self, message):
+        """Queues `message` without blocking; returns False if the client has fallen behind."""
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def drop(self, reason):
+        # Replace whatever is still queued with a single final message
+        self.dropped = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait({"type": "dropped", "reason": reason})
+
+    async def get(self):
+        return await self._queue.get()
+
+
+class NamespaceChannel:
+    """
+    Holds the one informer listener for a namespace, rebuilds the topology
+    once per debounce window and fans the resulting patch out to every
+    subscriber.
+    """
+
+    def __init__(self, namespace, informer, build_resources):
+        self.namespace = namespace
+        self.informer = informer
+        self.subscribers = set()
+        self.resources = []
+        self.objects = {}
+        self._build_resources = build_resources
+        self._changed = asyncio.Event()
+        self.started = None
+        self._loop = None
+        self._task = None
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        await asyncio.to_thread(self.informer.wait_until_synced, Config.INFORMER_SYNC_TIMEOUT)
+        self.informer.add_listener(self._on_change)
+        self.resources = await self._build_resources(self.informer)
+        self.objects = flatten_resources(self.resources)
+        # Everyone who subscribed while the informer synced gets the first snapshot
+        self.publish(self.snapshot_message())
+        self._task = asyncio.create_task(self._run())
+
+    def snapshot_message(self):
+        return {"type": "snapshot", "resources": self.resources}
+
+    async def close(self):
+        self.informer.remove_listener(self._on_change)
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def publish(self, message):
+        for sub in list(self.subscribers):
+            if not sub.offer(message):
+                print(f"[ResourceHub] {self.namespace}: dropping slow subscriber")
+                self.subscribers.discard(sub)
+                sub.drop("Client fell behind; reconnect for a fresh snapshot")
+
+    def _on_change(self, kind, event_type, obj):
+        # Called from informer watch threads
+        self._loop.call_soon_threadsafe(self._changed.set)
+
+    async def _run(self):
+        while True:
+            await self._changed.wait()
+            # Debounce: every event that lands during the window goes into one patch
+            await asyncio.sleep(Config.WS_DEBOUNCE_SECONDS)
+            self._changed.clear()
+
+            try:
+                resources = await self._build_resources(self.informer)
+            except Exception as e:
+                print(f"[ResourceHub] {self.namespace}: rebuild failed: {e}")
+                continue
+
+            latest = flatten_resources(resources)
+            patch = diff_resources(self.objects, latest)
+            self.resources, self.objects = resources, latest
+            if patch["added"] or patch["updated"] or patch["deleted"]:
+                self.publish({"type": "patch", **patch})
+
+
+class ResourceHub:
+    """
+    Pub/sub hub for /ws/resources: every client watching a namespace shares
+    one informer listener and one rebuild per change. The namespace is
+    released when its last subscriber leaves.
+
+    Clients get one `snapshot` message with the full topology tree, then
+    `patch` messages over flattened objects (see flatten_resources):
+    `added`/`updated` carry only the changed objects, `deleted` their uids.
+    """
+
+    def __init__(self, build_resources, queue_size=None):
+        self.queue_size = queue_size or Config.WS_CLIENT_QUEUE_SIZE
+        self._build_resources = build_resources
+        # namespace -> channel; a channel is listed from the moment it starts opening.
+        # Bookkeeping never awaits, so the event loop alone keeps it consistent.
+        self._channels = {}
+
+    async def subscribe(self, namespace, api_client):
+        channel = self._channels.get(namespace)
+        if channel is None:
+            channel = NamespaceChannel(namespace, informers.acquire(namespace, api_client), self._build_resources)
+            channel.started = asyncio.create_task(self._open(channel))
+            self._channels[namespace] = channel
+
+        sub = Subscription(namespace, self.queue_size)
+        if channel.started.done():
+            sub.offer(channel.snapshot_message())
+        channel.subscribers.add(sub)
+
+        try:
+            # Only this namespace's subscribers wait for its informer sync and first build
+            await asyncio.shield(channel.started)
+        except BaseException:
+            await self.unsubscribe(sub)
+            raise
+        return sub
+
+    async def unsubscribe(self, sub):
+        channel = self._channels.get(sub.namespace)
+        if channel is None:
+            return
+        channel.subscribers.discard(sub)
+        if channel.subscribers:
+            return
+        del self._channels[sub.namespace]
+
+        # The last subscriber may leave before the channel has finished opening
+        channel.started.cancel()
+        await channel.close()
+        informers.release(channel.informer)
+        print(f"[ResourceHub] Closed channel for '{sub.namespace}'")
+
+    async def _open(self, channel):
+        try:
+            await channel.start()
+        except BaseException:
+            # Unless unsubscribe() already took it down, a failed start releases the namespace here
+            if self._channels.get(channel.namespace) is channel:
+                del self._channels[channel.namespace]
+                await channel.close()
+                informers.release(channel.informer)
+            raise
+        print(f"[ResourceHub] Opened channel for '{channel.namespace}'")
+
+    def stats(self):
+        return {namespace: len(channel.subscribers) for namespace, channel in self._channels.items()}
@@ -0,0 +1,138 @@
+# resource_query.py
+
+"""
+Field projection and server-side filtering for /api/environment-resources.
+
+Query parameters (all optional, list values are comma separated):
+    fields       node keys to return, e.g. `fields=name,type,status`
+    k8s_type     top-level Kubernetes kinds, e.g. `k8s_type=Service,Deployment`
+    type         inferred service types, e.g. `type=API,DB`
+    status       node statuses, e.g. `status=Running,Pending`
+    name_prefix  top-level name prefix
+    depth        levels of `associated` to keep (0 = top-level nodes only)
+    compact      `true` drops empty values (`pvcs: []`, `cluster_ip: ""`, ...)
+
+Filters apply to top-level nodes. Kind and name are checked before a node is
+built or classified; type and status as soon as they are known.
+"""
+
+import copy
+import hashlib
+
+_TRUE = ("1", "true", "yes")
+
+
+def _csv(value):
+    if not value:
+        return None
+    items = frozenset(part.strip() for part in value.split(",") if part.strip())
+    return items or None
+
+
+class ResourceQuery:
+    def __init__(self, fields=None, k8s_types=None, types=None, statuses=None,
+                 name_prefix=None, depth=None, compact=False):
+        self.fields = fields
+        self.k8s_types = k8s_types
+        self.types = types
+        self.statuses = statuses
+        self.name_prefix = name_prefix
+        self.depth = depth
+        self.compact = compact
+
+    @classmethod
+    def from_args(cls, args):
+        """Parses request args; raises ValueError on a malformed `depth`."""
+        depth = args.get("depth")
+        if depth is not None:
+            if not depth.isdigit():
+                raise ValueError("depth must be a non-negative integer")
+            depth = int(depth)
+
+        return cls(
+            fields=_csv(args.get("fields")),
+            k8s_types=_csv(args.get("k8s_type")),
+            types=_csv(args.get("type")),
+            statuses=_csv(args.get("status")),
+            name_prefix=args.get("name_prefix") or None,
+            depth=depth,
+            compact=(args.get("compact") or "").lower() in _TRUE,
+        )
+
+    def is_default(self):
+        return self.cache_key() == ""
+
+    def cache_key(self):
+        """Canonical form of the query; empty when it changes nothing."""
+        parts = []
+        for name in ("fields", "k8s_types", "types", "statuses"):
+            values = getattr(self, name)
+            if values:
+                parts.append(f"{name}={','.join(sorted(values))}")
+        if self.name_prefix:
+            parts.append(f"name_prefix={self.name_prefix}")
+        if self.depth is not None:
+            parts.append(f"depth={self.depth}")
+        if self.compact:
+            parts.append("compact")
+        return "&".join(parts)
+
+    def etag(self, version_token):
+        """Per-query ETag, so differently shaped responses never share a validator."""
+        key = self.cache_key()
+        if not key:
+            return version_token
+        digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+        return f"{version_token}-{digest}"
+
+    def admits(self, k8s_type, name):
+        if self.k8s_types and k8s_type not in self.k8s_types:
+            return False
+        if self.name_prefix and not name.startswith(self.name_prefix):
+            return False
+        return True
+
+    def admits_type(self, resource_type):
+        return not self.types or resource_type in self.types
+
+    def admits_status(self, status):
+        return not self.statuses or status in self.statuses
+
+    def keeps(self, key):
+        """Whether projected nodes keep `key` (always, unless `fields` leaves it out)."""
+        return self.fields is None or key in self.fields
+
+    def keeping(self, key):
+        """This query with `key` added to `fields` when they would drop it."""
+        if self.keeps(key):
+            return self
+        query = copy.copy(self)
+        query.fields = self.fields | {key}
+        return query
+
+    def project(self, node):
+        """
+        Returns `node` shaped by fields/depth/compact. Nodes may be memoized
+        and shared, so any change is made on a copy.
+        """
+        if self.fields is None and self.depth is None and not self.compact:
+            return node
+        return self._project(node, 0)
+
+    def _project(self, node, level):
+        out = {}
+        for key, value in node.items():
+            if self.fields is not None and key not in self.fields:
+                continue
+            if key == "associated":
+                if self.depth is not None and level >= self.depth:
+                    value = []
+                else:
+                    value = [self._project(child, level + 1) for child in value]
+            if self.compact and (value is None or value == "" or value == []):
+                continue
+            out[key] = value
+        return out
+
+
+DEFAULT_QUERY = ResourceQuery()
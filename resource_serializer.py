@@ -0,0 +1,102 @@
+# resource_serializer.py
+
+import threading
+
+
+def pod_fields(pod):
+    return {
+        "k8s_type": "Pod",
+        "name": pod.name,
+        "uid": pod.uid,
+        "status": pod.phase,
+        "created_at": pod.created_at,
+        "pvcs": list(pod.pvcs),
+    }
+
+
+def workload_fields(k8s_type, obj):
+    return {
+        "k8s_type": k8s_type,
+        "name": obj.name,
+        "uid": obj.uid,
+        "status": "Available" if obj.ready_replicas else "Pending",
+        "created_at": obj.created_at,
+        "pvcs": [],
+    }
+
+
+def service_fields(svc):
+    return {
+        "k8s_type": "Service",
+        "name": svc.name,
+        "uid": svc.uid,
+        "status": "Active",
+        "created_at": svc.created_at,
+        "pvcs": [],
+        "cluster_ip": svc.cluster_ip,
+        "ports": [f"{port}/{protocol}" for port, protocol in svc.ports],
+    }
+
+
+def top_level_node(resource_type, node, cluster_ip="", ports=None):
+    return {
+        "type": resource_type,
+        **node,
+        "cluster_ip": cluster_ip,
+        "ports": ports or [],
+        "associated": node.get("associated", []),
+    }
+
+
+class NodeSerializer:
+    """
+    Builds the per-object part of topology nodes and memoizes it by
+    (uid, resourceVersion), so unchanged objects are not re-serialized on
+    every request. Memoized dicts are shared between responses and must not
+    be mutated; callers copy them when adding `associated` or `type`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._nodes = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def pod_node(self, pod):
+        return self._memo(pod, pod_fields)
+
+    def workload_node(self, k8s_type, obj, pods):
+        fields = self._memo(obj, lambda o: workload_fields(k8s_type, o))
+        return {**fields, "associated": [self.pod_node(pod) for pod in pods]}
+
+    def service_node(self, resource_type, svc, associated):
+        fields = self._memo(svc, service_fields)
+        return {"type": resource_type, **fields, "associated": associated}
+
+    def evict(self, uid):
+        with self._lock:
+            self._nodes.pop(uid, None)
+
+    def retain(self, uids):
+        """Drops every memoized node whose uid is no longer live."""
+        with self._lock:
+            for uid in [uid for uid in self._nodes if uid not in uids]:
+                del self._nodes[uid]
+
+    def stats(self):
+        return {"entries": len(self._nodes), "hits": self.hits, "misses": self.misses}
+
+    def _memo(self, obj, build):
+        with self._lock:
+            entry = self._nodes.get(obj.uid)
+            if entry is not None and entry[0] == obj.resource_version:
+                self.hits += 1
+                return entry[1]
+        node = build(obj)
+        with self._lock:
+            self.misses += 1
+            self._nodes[obj.uid] = (obj.resource_version, node)
+        return node
@@ -0,0 +1,109 @@
+# service_classifier.py
+
+"""
+Cheap tiers of the service-type classifier, tried before the embedding
+model: well-known ports, then well-known image repositories, then name
+rules with a confidence score. Only workloads none of them is sure about
+go to the model.
+"""
+
+import re
+from collections import Counter
+from classification_cache import split_image
+from config import Config
+
+TIERS = ("port", "image", "name", "embedding", "fallback")
+
+WELL_KNOWN_PORTS = {
+    5432: "DB",      # PostgreSQL
+    3306: "DB",      # MySQL / MariaDB
+    27017: "DB",     # MongoDB
+    9042: "DB",      # Cassandra
+    26257: "DB",     # CockroachDB
+    6379: "Cache",   # Redis / Valkey / KeyDB
+    11211: "Cache",  # Memcached
+}
+
+WELL_KNOWN_IMAGES = {
+    "postgres": "DB", "postgresql": "DB", "timescaledb": "DB", "mysql": "DB", "mariadb": "DB",
+    "mongo": "DB", "mongodb": "DB", "cassandra": "DB", "cockroach": "DB", "clickhouse-server": "DB",
+    "influxdb": "DB", "neo4j": "DB",
+    "redis": "Cache", "memcached": "Cache", "valkey": "Cache", "keydb": "Cache", "dragonfly": "Cache",
+    "nginx": "Proxy", "ingress-nginx": "Proxy", "haproxy": "Proxy", "envoy": "Proxy", "traefik": "Proxy",
+    "caddy": "Proxy", "squid": "Proxy", "oauth2-proxy": "Proxy", "pgbouncer": "Proxy",
+}
+
+NAME_KEYWORDS = {
+    "API": {"api", "gateway", "auth", "service", "svc", "backend", "graphql", "grpc", "rest"},
+    "DB": {"db", "database", "postgres", "postgresql", "pg", "mysql", "mariadb", "mongo", "mongodb",
+           "cassandra", "cockroachdb", "clickhouse", "timescale", "influxdb", "neo4j"},
+    "Cache": {"cache", "redis", "memcached", "valkey", "keydb", "dragonfly", "hazelcast"},
+    "Frontend": {"frontend", "front", "ui", "web", "react", "nextjs", "vue", "angular", "svelte",
+                 "portal", "storefront", "site", "dashboard"},
+    "Worker": {"worker", "job", "cron", "cronjob", "consumer", "celery", "sidekiq", "processor",
+               "runner", "scheduler", "batch", "etl"},
+    "Proxy": {"proxy", "nginx", "haproxy", "envoy", "traefik", "ingress", "caddy", "router"},
+}
+
+# Cumulative hits per tier since startup, for /api/metrics
+classification_tiers = Counter()
+
+
+def _port_number(port):
+    # Service ports arrive as "5432/TCP", container ports as ints
+    try:
+        return int(str(port).split("/", 1)[0])
+    except ValueError:
+        return None
+
+
+def classify_by_port(ports):
+    for port in ports or []:
+        resource_type = WELL_KNOWN_PORTS.get(_port_number(port))
+        if resource_type:
+            return resource_type
+    return None
+
+
+def classify_by_image(image):
+    repository = split_image(image)[0]
+    # Most specific path component first: "bitnami/postgresql" -> "postgresql"
+    for component in reversed(repository.split("/")):
+        resource_type = WELL_KNOWN_IMAGES.get(component)
+        if resource_type:
+            return resource_type
+    return None
+
+
+def name_rule(name):
+    """
+    (type, confidence) from the name's tokens. Each token naming a type is
+    one vote; confidence is the winning type's share of the votes.
+    """
+    votes = Counter()
+    for token in re.split(r"[-_.]", name.lower()):
+        for resource_type, keywords in NAME_KEYWORDS.items():
+            if token in keywords:
+                votes[resource_type] += 1
+    if not votes:
+        return None, 0.0
+    resource_type, count = votes.most_common(1)[0]
+    return resource_type, count / sum(votes.values())
+
+
+def classify_by_rules(name, ports=None, image=None):
+    """(tier, type) from the first confident cheap tier, or (None, None) when the model has to decide."""
+    resource_type = classify_by_port(ports)
+    if resource_type:
+        return "port", resource_type
+    resource_type = classify_by_image(image)
+    if resource_type:
+        return "image", resource_type
+    resource_type, confidence = name_rule(name)
+    if resource_type and confidence >= Config.CLASSIFY_NAME_RULE_CONFIDENCE:
+        return "name", resource_type
+    return None, None
+
+
+def tier_counts(tiers):
+    return {tier: tiers[tier] for tier in TIERS}
@@ -0,0 +1,53 @@
+# single_flight.py
+
+import asyncio
+
+_groups = {}
+
+
+class SingleFlight:
+    """
+    Request coalescing: concurrent callers asking for the same key await one
+    shared in-flight computation instead of each doing the work. The
+    computation runs as its own task, so a caller that disconnects does not
+    cancel it for the others.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self._inflight = {}
+        _groups[name] = self
+
+    async def do(self, key, fn):
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key, task):
+        self._inflight.pop(key, None)
+        # Mark the exception retrieved even if every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesce_rate": round(self.coalesced / self.calls, 4) if self.calls else 0.0,
+            "in_flight": len(self._inflight),
+        }
+
+
+def single_flight_stats():
+    return {name: group.stats() for name, group in _groups.items()}
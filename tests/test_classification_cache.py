@@ -0,0 +1,67 @@
+# tests/test_classification_cache.py
+
+import sqlite3
+
+import pytest
+
+import embedding_utils
+from classification_cache import ClassificationCache, classification_identity, pod_base_name, split_image
+
+
+@pytest.mark.parametrize("pod, base", [
+    ("web-7c6b4d9f8-xk2lp", "web"),                     # Deployment: pod-template-hash + random
+    ("billing-api-5c6d7f8b9-q7zt4", "billing-api"),
+    ("etl-job-b4k2m", "etl-job"),                       # ReplicaSet or Job: random only
+    ("postgres-0", "postgres"),                         # StatefulSet ordinal
+    ("redis-master-12", "redis-master"),
+    ("nightly-report-28912345-q7zt4", "nightly-report"),  # CronJob -> Job -> Pod
+    ("cache-worker", "cache-worker"),                   # vowels: not a generated suffix
+    ("web-7c6b4-xk2lp", "web-7c6b4"),                   # hash too short for a pod-template-hash
+    ("0", "0"),                                         # never strip to nothing
+])
+def test_pod_base_name(pod, base):
+    assert pod_base_name(pod) == base
+
+
+@pytest.mark.parametrize("name", ["api-https", "web-html5", "node-xmpp2", "redis-6", "db-2fd5c"])
+def test_identity_keeps_names_as_given(name):
+    assert classification_identity(name, "nginx:1.27") == (name, "nginx")
+
+
+@pytest.mark.parametrize("image, parts", [
+    ("nginx", ("nginx", None, None)),
+    ("nginx:1.27", ("nginx", "1.27", None)),
+    ("registry:5000/team/app", ("registry:5000/team/app", None, None)),
+    ("registry:5000/team/app:1.2@sha256:abc", ("registry:5000/team/app", "1.2", "sha256:abc")),
+    ("app@sha256:abc", ("app", None, "sha256:abc")),
+    (None, ("", None, None)),
+])
+def test_split_image(image, parts):
+    assert split_image(image) == parts
+
+
+def test_cache_is_lru_and_persists(tmp_path):
+    path = str(tmp_path / "classifications.db")
+    cache = ClassificationCache(maxsize=2, path=path)
+    cache.put_many({("m", "a", ""): "API", ("m", "b", ""): "DB"})
+    cache.get_many([("m", "a", "")])
+    cache.put_many({("m", "c", ""): "Cache"})
+    assert list(cache._entries) == [("m", "a", ""), ("m", "c", "")]
+
+    reopened = ClassificationCache(maxsize=2, path=path)
+    assert reopened.get_many([("m", "b", ""), ("m", "x", "")]) == {("m", "b", ""): "DB"}
+    assert reopened.stats()["disk_hits"] == 1 and reopened.stats()["misses"] == 1
+
+
+def test_failed_cache_write_keeps_the_computed_types(monkeypatch, tmp_path):
+    cache = ClassificationCache(path=str(tmp_path / "types.sqlite"))
+
+    def locked(values):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(cache, "put_many", locked)
+    monkeypatch.setattr(embedding_utils, "classification_cache", cache)
+    monkeypatch.setattr(embedding_utils, "classify_texts", lambda texts: ["DB"] * len(texts))
+    monkeypatch.setattr(embedding_utils._ready, "is_set", lambda: True)
+
+    assert embedding_utils.embed_classify_batch([("orders", None), ("billing", "pg:16")]) == ["DB", "DB"]
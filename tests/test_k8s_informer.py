@@ -0,0 +1,129 @@
+# tests/test_k8s_informer.py
+
+import json
+import random
+import time
+
+import pytest
+from kubernetes.client import ApiClient, Configuration
+from kubernetes.client.rest import ApiException
+
+import k8s_informer
+from k8s_informer import FINGERPRINT_MODULUS, InformerRegistry, NamespaceInformer, object_fingerprint
+from k8s_records import PodRecord
+
+
+class FakeResponse:
+    def __init__(self, body, status=200):
+        self.status = status
+        self.reason = "OK" if status == 200 else "Not Found"
+        self.data = json.dumps(body).encode()
+
+    def stream(self, amt=None, decode_content=False):
+        return iter([])
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        pass
+
+
+def raw_pod(name, version):
+    return {"metadata": {"name": name, "uid": f"uid-{name}", "resourceVersion": str(version)}}
+
+
+def reference_token(informer):
+    # What version_token() used to compute: a full scan of every cached object
+    objects = [obj for kind in informer._stores for obj in informer.list(kind)]
+    total = sum(object_fingerprint(obj) for obj in objects) % FINGERPRINT_MODULUS
+    return f"{len(objects):x}-{total:032x}"
+
+
+def test_incremental_token_matches_a_full_scan():
+    rng = random.Random(8)
+    informer = NamespaceInformer("ns", ApiClient(Configuration()))
+    pods = {f"pod-{i}": raw_pod(f"pod-{i}", i) for i in range(20)}
+    informer._relist("pods", lambda namespace, **kwargs: FakeResponse({"metadata": {}, "items": list(pods.values())}))
+    assert informer.version_token() == reference_token(informer)
+
+    version = 100
+    previous = informer.version_token()
+    for _ in range(500):
+        version += 1
+        name = f"pod-{rng.randint(0, 30)}"
+        event_type = rng.choice(["ADDED", "MODIFIED", "DELETED", "DELETED", "BOOKMARK"])
+        if event_type == "DELETED" and name not in pods:
+            continue
+        informer._apply("pods", event_type, PodRecord(raw_pod(name, version)))
+        if event_type == "DELETED":
+            pods.pop(name)
+        elif event_type != "BOOKMARK":
+            pods[name] = raw_pod(name, version)
+
+        token = informer.version_token()
+        assert token == reference_token(informer)
+        assert (token == previous) == (event_type == "BOOKMARK")
+        previous = token
+
+
+def test_token_can_be_limited_to_kinds():
+    informer = NamespaceInformer("ns", ApiClient(Configuration()))
+    informer._apply("pods", "ADDED", PodRecord(raw_pod("a", 1)))
+    assert informer.version_token(["services"]) == f"0-{0:032x}"
+    assert informer.version_token(["pods"]) == informer.version_token()
+
+
+def test_informer_lists_through_its_own_api_client():
+    api_client = ApiClient(Configuration())
+    informer = NamespaceInformer("ns", api_client)
+    assert all(fn.__self__.api_client is api_client for fn in informer._list_functions.values())
+
+
+def test_watch_read_timeout_outlasts_the_server_side_timeout():
+    calls = []
+
+    def list_fn(namespace, **kwargs):
+        calls.append(kwargs)
+        return FakeResponse({"metadata": {}, "items": []})
+
+    informer = NamespaceInformer("ns", ApiClient(Configuration()))
+    informer._relist("pods", list_fn)
+    informer._watch("pods", list_fn, time.monotonic() + 60)
+
+    connect, read = calls[1]["_request_timeout"]
+    assert calls[1]["watch"] and read > calls[1]["timeout_seconds"]
+    assert "_request_timeout" in calls[0]
+
+
+def test_unknown_namespace_stops_its_informer_without_retrying(monkeypatch):
+    calls = []
+
+    def not_found(namespace, **kwargs):
+        calls.append(namespace)
+        return FakeResponse({}, status=404)
+
+    monkeypatch.setattr(k8s_informer, "informer_list_functions", lambda api_client: {"pods": not_found, "services": not_found})
+    monkeypatch.setattr(k8s_informer, "RETRY_BACKOFF_SECONDS", 0.01)
+    registry = InformerRegistry()
+    informer = registry.get("missing", None)
+    with pytest.raises(ApiException):
+        informer.wait_until_synced(5)
+
+    time.sleep(0.3)
+    # At most the one initial list per kind, however long the informer stays registered
+    assert informer.is_stopped() and len(calls) <= 2
+
+    # The next request starts afresh rather than reusing the stopped informer
+    assert registry.get("missing", None) is not informer
+    registry.stop("missing")
+
+
+def test_release_ignores_a_replaced_informer(monkeypatch):
+    monkeypatch.setattr(NamespaceInformer, "start", lambda self: None)
+    registry = InformerRegistry()
+    old = registry.acquire("ns", None)
+    old.stop()
+    new = registry.acquire("ns", None)
+    registry.release(old)
+    assert new is not old and new.holders == 1 and not new.is_stopped()
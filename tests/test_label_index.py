@@ -0,0 +1,64 @@
+# tests/test_label_index.py
+
+import random
+from types import SimpleNamespace
+
+from label_index import LabelIndex
+from label_selector import select
+
+KEYS = ["app", "tier", "env", "team"]
+VALUES = ["a", "b", "c"]
+OPERATORS = ["In", "NotIn", "Exists", "DoesNotExist"]
+
+
+def random_labels(rng):
+    return {key: rng.choice(VALUES) for key in rng.sample(KEYS, rng.randint(0, len(KEYS)))}
+
+
+def random_selector(rng):
+    if rng.random() < 0.3:
+        # Service-style equality map, sometimes empty (selects nothing)
+        return random_labels(rng)
+    selector = {"matchLabels": {key: rng.choice(VALUES) for key in rng.sample(KEYS, rng.randint(0, 2))}}
+    selector["matchExpressions"] = [
+        {"key": rng.choice(KEYS), "operator": op, "values": rng.sample(VALUES, rng.randint(1, 2))}
+        for op in rng.choices(OPERATORS, k=rng.randint(0, 3))
+    ]
+    return selector
+
+
+def test_index_agrees_with_the_reference_evaluator():
+    rng = random.Random(20261017)
+    index = LabelIndex()
+    objects = {}
+
+    for _ in range(2000):
+        name = f"obj-{rng.randint(0, 60)}"
+        if name in objects and rng.random() < 0.25:
+            del objects[name]
+            index.remove(name)
+        else:
+            objects[name] = SimpleNamespace(name=name, labels=random_labels(rng))
+            index.add(name, objects[name].labels)
+
+        selector = random_selector(rng)
+        expected = {obj.name for obj in select(selector, objects.values())}
+        assert index.select(selector) == expected, selector
+
+    assert len(index) == len(objects)
+
+
+def test_relabel_moves_an_object_between_pairs():
+    index = LabelIndex()
+    index.add("web", {"app": "web", "tier": "fe"})
+    index.add("web", {"app": "web"})
+    assert index.select({"tier": "fe"}) == set()
+    assert index.select({"app": "web"}) == {"web"}
+
+
+def test_clear_empties_the_index():
+    index = LabelIndex()
+    index.add("a", {"app": "a"})
+    index.clear()
+    assert len(index) == 0
+    assert index.select({"matchLabels": {}}) == set()
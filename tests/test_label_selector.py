@@ -0,0 +1,69 @@
+# tests/test_label_selector.py
+
+from types import SimpleNamespace
+
+import pytest
+from kubernetes import client
+
+from label_selector import labels_match, parse_selector, select
+
+
+def record(name, labels):
+    return SimpleNamespace(name=name, labels=labels)
+
+
+def test_service_selector_is_an_equality_map():
+    assert parse_selector({"app": "web", "tier": "fe"}) == [("app", "In", ["web"]), ("tier", "In", ["fe"])]
+
+
+def test_missing_or_empty_service_selector_selects_nothing():
+    assert parse_selector(None) is None
+    assert parse_selector({}) is None
+    assert not labels_match(None, {"app": "web"})
+
+
+def test_empty_label_selector_selects_everything():
+    assert parse_selector({"matchLabels": {}}) == []
+    assert labels_match([], {})
+    assert labels_match([], {"app": "web"})
+
+
+def test_raw_json_and_client_model_selectors_parse_alike():
+    raw = {
+        "matchLabels": {"app": "web"},
+        "matchExpressions": [{"key": "env", "operator": "NotIn", "values": ["dev"]}],
+    }
+    model = client.V1LabelSelector(
+        match_labels={"app": "web"},
+        match_expressions=[client.V1LabelSelectorRequirement(key="env", operator="NotIn", values=["dev"])],
+    )
+    assert parse_selector(raw) == parse_selector(model) == [("app", "In", ["web"]), ("env", "NotIn", ["dev"])]
+
+
+@pytest.mark.parametrize("operator, values, labels, expected", [
+    ("In", ["a", "b"], {"k": "b"}, True),
+    ("In", ["a"], {"k": "b"}, False),
+    ("In", ["a"], {}, False),
+    ("NotIn", ["a"], {"k": "b"}, True),
+    ("NotIn", ["a"], {"k": "a"}, False),
+    ("NotIn", ["a"], {}, True),
+    ("Exists", [], {"k": ""}, True),
+    ("Exists", [], {}, False),
+    ("DoesNotExist", [], {}, True),
+    ("DoesNotExist", [], {"k": "a"}, False),
+])
+def test_operators(operator, values, labels, expected):
+    selector = {"matchExpressions": [{"key": "k", "operator": operator, "values": values}]}
+    assert labels_match(parse_selector(selector), labels) is expected
+
+
+def test_unknown_operator_is_rejected():
+    with pytest.raises(ValueError):
+        parse_selector({"matchExpressions": [{"key": "k", "operator": "Gt", "values": ["1"]}]})
+
+
+def test_select_reads_record_labels():
+    objects = [record("a", {"app": "web"}), record("b", {"app": "db"}), record("c", {})]
+    assert [obj.name for obj in select({"app": "web"}, objects)] == ["a"]
+    assert [obj.name for obj in select({"matchLabels": {}}, objects)] == ["a", "b", "c"]
+    assert select({}, objects) == []
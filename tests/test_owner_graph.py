@@ -0,0 +1,84 @@
+# tests/test_owner_graph.py
+
+from types import SimpleNamespace
+
+from owner_graph import OwnerGraph
+
+
+def obj(name, uid, *owners, kind="Pod"):
+    references = [SimpleNamespace(uid=owner.uid, name=owner.name, kind=owner.kind) for owner in owners]
+    return SimpleNamespace(name=name, uid=uid, kind=kind, owner_references=references)
+
+
+def build():
+    dep = obj("web", "dep-web", kind="Deployment")
+    old_rs = obj("web-5d9f8", "rs-old", dep, kind="ReplicaSet")
+    new_rs = obj("web-7c6b4", "rs-new", dep, kind="ReplicaSet")
+    sts = obj("db", "sts-db", kind="StatefulSet")
+    cron = obj("nightly", "cron-nightly", kind="CronJob")
+    job = obj("nightly-2890", "job-1", cron, kind="Job")
+    pods = [
+        obj("web-7c6b4-xk2lp", "p1", new_rs),
+        obj("web-5d9f8-abcde", "p2", old_rs),
+        obj("db-0", "p3", sts),
+        obj("nightly-2890-q8z7w", "p4", job),
+        obj("orphan", "p5"),
+        # A pod named like a controller must not be mistaken for one
+        obj("web", "p6"),
+    ]
+    return OwnerGraph.build({
+        "deployments": [dep],
+        "replicasets": [old_rs, new_rs],
+        "statefulsets": [sts],
+        "cronjobs": [cron],
+        "jobs": [job],
+        "pods": pods,
+    })
+
+
+def names(pods):
+    return [pod.name for pod in pods]
+
+
+def test_deployment_pods_come_through_every_replicaset():
+    assert names(build().pods_of("Deployment", "web")) == ["web-5d9f8-abcde", "web-7c6b4-xk2lp"]
+
+
+def test_direct_and_nested_controllers():
+    graph = build()
+    assert names(graph.pods_of("StatefulSet", "db")) == ["db-0"]
+    assert names(graph.pods_of("CronJob", "nightly")) == ["nightly-2890-q8z7w"]
+    assert names(graph.pods_of("ReplicaSet", "web-7c6b4")) == ["web-7c6b4-xk2lp"]
+
+
+def test_kind_is_part_of_the_lookup():
+    graph = build()
+    assert graph.pods_of("StatefulSet", "web") == []
+    assert graph.pods_of("Deployment", "missing") == []
+
+
+def test_pods_of_controller_searches_every_controller_kind_once():
+    graph = build()
+    assert names(graph.pods_of_controller("web")) == ["web-5d9f8-abcde", "web-7c6b4-xk2lp"]
+    assert names(graph.pods_of_controller("nightly-2890")) == ["nightly-2890-q8z7w"]
+    assert graph.pods_of_controller("orphan") == []
+
+
+def test_owner_cycles_terminate():
+    a = SimpleNamespace(name="a", uid="a", kind="Deployment", owner_references=[])
+    b = obj("b", "b", a)
+    a.owner_references.append(SimpleNamespace(uid="b"))
+    graph = OwnerGraph.build({"deployments": [a], "replicasets": [b]})
+    assert graph.descendants("a") == [b, a]
+
+
+def test_owner_names_resolve_without_the_top_level_controllers():
+    full = build()
+    # What /api/logs lists: pods, ReplicaSets and Jobs only
+    partial = OwnerGraph.build({
+        "replicasets": [obj for obj in full._objects.values() if full._kinds[obj.uid] == "ReplicaSet"],
+        "jobs": [obj for obj in full._objects.values() if full._kinds[obj.uid] == "Job"],
+        "pods": [obj for obj in full._objects.values() if full._kinds[obj.uid] == "Pod"],
+    })
+    for name in ("web", "db", "nightly", "nightly-2890", "web-7c6b4", "orphan", "missing"):
+        assert names(partial.pods_owned_by_name(name)) == names(full.pods_of_controller(name))
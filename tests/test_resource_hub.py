@@ -0,0 +1,180 @@
+# tests/test_resource_hub.py
+
+import asyncio
+import threading
+
+import pytest
+
+import resource_hub
+from resource_hub import ResourceHub, diff_resources, flatten_resources
+
+
+def pod(uid, status="Running"):
+    return {"k8s_type": "Pod", "name": uid, "uid": uid, "status": status}
+
+
+def topology(pods):
+    deployment = {"k8s_type": "Deployment", "name": "web", "uid": "dep", "status": "Available", "associated": pods}
+    return [{"type": "Frontend", "k8s_type": "Service", "name": "web", "uid": "svc", "associated": [deployment]}]
+
+
+def test_flatten_keeps_every_object_once_with_its_parent():
+    objects = flatten_resources(topology([pod("p1"), pod("p2")]))
+    assert list(objects) == ["svc", "dep", "p1", "p2"]
+    assert objects["svc"]["parent"] is None
+    assert objects["dep"]["parent"] == "svc"
+    assert objects["p2"] == {**pod("p2"), "parent": "dep"}
+    assert all("associated" not in node for node in objects.values())
+
+
+def test_flatten_does_not_mutate_shared_nodes():
+    tree = topology([pod("p1")])
+    flatten_resources(tree)
+    assert tree[0]["associated"][0]["associated"] == [pod("p1")]
+
+
+def test_one_pod_change_patches_only_that_pod():
+    pods = [pod(f"p{i}") for i in range(50)]
+    previous = flatten_resources(topology(pods))
+    latest = flatten_resources(topology(pods[:10] + [pod("p10", "Pending")] + pods[11:]))
+
+    patch = diff_resources(previous, latest)
+    assert patch == {"added": [], "updated": [{**pod("p10", "Pending"), "parent": "dep"}], "deleted": []}
+
+
+def test_rollout_adds_and_deletes_pods_without_resending_parents():
+    previous = flatten_resources(topology([pod("old-1"), pod("old-2")]))
+    latest = flatten_resources(topology([pod("new-1"), pod("old-2")]))
+
+    patch = diff_resources(previous, latest)
+    assert [node["uid"] for node in patch["added"]] == ["new-1"]
+    assert patch["updated"] == []
+    assert patch["deleted"] == ["old-1"]
+
+
+def test_moving_a_pod_to_another_parent_is_an_update():
+    previous = flatten_resources(topology([pod("p1")]))
+    latest = flatten_resources([*topology([]), {**pod("p1"), "type": "Unknown", "associated": []}])
+
+    patch = diff_resources(previous, latest)
+    assert patch["updated"] == [{**pod("p1"), "type": "Unknown", "parent": None}]
+
+
+class FakeInformer:
+    def __init__(self, namespace, synced, error=None):
+        self.namespace = namespace
+        self.synced = synced
+        self.error = error
+        self.listeners = []
+
+    def wait_until_synced(self, timeout):
+        if not self.synced.wait(timeout):
+            raise TimeoutError(self.namespace)
+        if self.error:
+            raise self.error
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+
+class FakeRegistry:
+    def __init__(self):
+        self.synced = {}
+        self.errors = {}
+        self.holders = {}
+
+    def acquire(self, namespace, api_client):
+        self.holders[namespace] = self.holders.get(namespace, 0) + 1
+        return FakeInformer(namespace, self.synced.setdefault(namespace, threading.Event()), self.errors.get(namespace))
+
+    def release(self, informer):
+        self.holders[informer.namespace] -= 1
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    fake = FakeRegistry()
+    monkeypatch.setattr(resource_hub, "informers", fake)
+    return fake
+
+
+async def build(informer):
+    return topology([pod(f"{informer.namespace}-pod")])
+
+
+def test_slow_namespace_does_not_block_others(registry):
+    async def scenario():
+        hub = ResourceHub(build)
+        slow = asyncio.create_task(hub.subscribe("slow", None))
+        await asyncio.sleep(0.05)
+
+        registry.synced["fast"] = threading.Event()
+        registry.synced["fast"].set()
+        fast = await asyncio.wait_for(hub.subscribe("fast", None), 1)
+        assert (await fast.get())["type"] == "snapshot"
+        await asyncio.wait_for(hub.unsubscribe(fast), 1)
+        assert not slow.done()
+
+        registry.synced["slow"].set()
+        sub = await asyncio.wait_for(slow, 1)
+        await hub.unsubscribe(sub)
+
+    asyncio.run(scenario())
+    assert registry.holders == {"slow": 0, "fast": 0}
+
+
+def test_concurrent_subscribers_share_one_channel_and_snapshot(registry):
+    async def scenario():
+        hub = ResourceHub(build)
+        waiting = [asyncio.create_task(hub.subscribe("ns", None)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        registry.synced["ns"].set()
+        subs = await asyncio.gather(*waiting)
+        late = await hub.subscribe("ns", None)
+
+        assert registry.holders == {"ns": 1}
+        assert hub.stats() == {"ns": 4}
+        for sub in [*subs, late]:
+            message = await sub.get()
+            assert message["type"] == "snapshot" and message["resources"][0]["uid"] == "svc"
+        for sub in [*subs, late]:
+            await hub.unsubscribe(sub)
+        assert hub.stats() == {}
+
+    asyncio.run(scenario())
+    assert registry.holders == {"ns": 0}
+
+
+def test_failed_start_reaches_every_waiter_and_releases_once(registry):
+    registry.errors["ns"] = RuntimeError("list failed")
+
+    async def scenario():
+        hub = ResourceHub(build)
+        waiting = [asyncio.create_task(hub.subscribe("ns", None)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        registry.synced["ns"].set()
+        results = await asyncio.gather(*waiting, return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert hub.stats() == {}
+
+    asyncio.run(scenario())
+    assert registry.holders == {"ns": 0}
+
+
+def test_last_waiter_leaving_during_start_releases_the_namespace(registry):
+    async def scenario():
+        hub = ResourceHub(build)
+        waiter = asyncio.create_task(hub.subscribe("ns", None))
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert hub.stats() == {}
+        registry.synced["ns"].set()
+
+    asyncio.run(scenario())
+    assert registry.holders == {"ns": 0}
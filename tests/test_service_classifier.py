@@ -0,0 +1,41 @@
+# tests/test_service_classifier.py
+
+import asyncio
+from collections import Counter
+
+import pytest
+
+import k8s_resource_api
+from service_classifier import classification_tiers, classify_by_rules, name_rule
+
+
+@pytest.mark.parametrize("name, ports, image, expected", [
+    ("orders", ["5432/TCP"], None, ("port", "DB")),
+    ("orders", [6379], "gcr.io/acme/orders:1", ("port", "Cache")),
+    ("orders", ["8080/TCP"], "bitnami/postgresql:16", ("image", "DB")),
+    ("orders", None, "registry:5000/nginx:1.27@sha256:abc", ("image", "Proxy")),
+    ("checkout-api", None, "gcr.io/acme/checkout:2", ("name", "API")),
+    ("redis-cache", None, None, ("name", "Cache")),
+    ("api-worker", None, None, (None, None)),  # split vote: left to the model
+    ("orders", None, None, (None, None)),
+])
+def test_classify_by_rules(name, ports, image, expected):
+    assert classify_by_rules(name, ports, image) == expected
+
+
+def test_name_rule_confidence_is_the_winning_vote_share():
+    assert name_rule("web-ui-api") == ("Frontend", pytest.approx(2 / 3))
+    assert name_rule("orders") == (None, 0.0)
+
+
+def test_running_tier_totals_are_not_recounted_globally():
+    before = classification_tiers["port"]
+    shared = Counter()
+
+    async def classify_twice():
+        for _ in range(2):
+            await k8s_resource_api.ai_infer_service_types([("orders", ["5432/TCP"], None)], shared)
+
+    asyncio.run(classify_twice())
+    assert shared["port"] == 2
+    assert classification_tiers["port"] - before == 2
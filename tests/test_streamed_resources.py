@@ -0,0 +1,140 @@
+# tests/test_streamed_resources.py
+
+import asyncio
+import json
+from urllib.parse import parse_qsl
+
+import pytest
+
+import k8s_paged_source
+import k8s_resource_api
+from benchmarks.fake_apiserver import KINDS, synthetic_namespace
+from k8s_informer import NamespaceInformer
+from k8s_paged_source import PagedNamespaceSource
+from resource_query import ResourceQuery
+
+PLURALS = {kind: plural for (_, plural), kind in KINDS.items()}
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.status = 200
+        self.reason = "OK"
+        self.data = json.dumps(body).encode()
+
+    def release_conn(self):
+        pass
+
+
+def list_function(items):
+    # Namespaced list with limit/continue paging, like the apiserver's
+    def list_fn(namespace, limit=None, _continue=None, **kwargs):
+        start = int(_continue or 0)
+        end = start + limit if limit else len(items)
+        token = str(end) if end < len(items) else None
+        return FakeResponse({"metadata": {"resourceVersion": "1", "continue": token}, "items": items[start:end]})
+    return list_fn
+
+
+def raw_pod(name, uid, labels, phase):
+    return {
+        "metadata": {"name": name, "namespace": "ns", "uid": uid, "resourceVersion": "1", "labels": labels},
+        "spec": {"containers": [{"image": "busybox"}]},
+        "status": {"phase": phase},
+    }
+
+
+@pytest.fixture
+def list_functions(monkeypatch):
+    objects = synthetic_namespace("ns", services=12, pods_per_workload=3)
+    # One bare pod a Service selects, one nothing claims
+    objects["Pod"].append(raw_pod("api-0-manual", "loose-1", {"app": "api-0"}, "Running"))
+    objects["Pod"].append(raw_pod("stray", "loose-2", {}, "Failed"))
+    functions = {PLURALS[kind]: list_function(items) for kind, items in objects.items()}
+
+    monkeypatch.setattr(k8s_paged_source, "informer_list_functions", lambda api_client: functions)
+    monkeypatch.setattr(k8s_resource_api, "embedding_ready", lambda: False)
+    monkeypatch.setattr(k8s_resource_api, "warm_up_in_background", lambda: None)
+    return functions
+
+
+def reassemble(lines, query):
+    """Nests `parent` lines under the nodes they name, then drops what `fields` did not ask for."""
+    top, by_uid = [], {}
+
+    def register(node):
+        if "uid" in node:
+            by_uid[node["uid"]] = node
+        for child in node.get("associated", []):
+            register(child)
+
+    for line in lines:
+        parent = line.pop("parent", None)
+        if parent is None:
+            top.append(line)
+        else:
+            by_uid[parent].setdefault("associated", []).append(line)
+        register(line)
+
+    def strip(node):
+        if not query.keeps("uid"):
+            node.pop("uid", None)
+        for child in node.get("associated", []):
+            strip(child)
+
+    for node in top:
+        strip(node)
+    return top
+
+
+def canonical(nodes):
+    # Sibling order differs between the modes; compare as sorted JSON
+    out = []
+    for node in nodes:
+        node = dict(node)
+        if "associated" in node:
+            node["associated"] = canonical(node["associated"])
+        out.append(json.dumps(node, sort_keys=True))
+    return sorted(out)
+
+
+@pytest.mark.parametrize("args", [
+    "",
+    "fields=name,type",
+    "fields=name,status",
+    "fields=name,associated",
+    "fields=name,type,associated&depth=1",
+    "depth=0",
+    "depth=1",
+    "compact=true",
+    "depth=1&compact=true",
+    "fields=name,status,associated&compact=true",
+    "status=Running",
+    "k8s_type=Pod,Deployment",
+])
+def test_reassembled_stream_matches_the_json_response(list_functions, args):
+    query = ResourceQuery.from_args(dict(parse_qsl(args)))
+
+    informer = NamespaceInformer("ns", None)
+    for kind, list_fn in list_functions.items():
+        informer._relist(kind, list_fn)
+
+    async def both():
+        resources = await k8s_resource_api.build_environment_resources(informer, query)
+        source = PagedNamespaceSource("ns", None, page_size=4)
+        lines = [line async for line in k8s_resource_api.iter_streamed_resources(source, query)]
+        return resources, lines
+
+    resources, lines = asyncio.run(both())
+    lines = [json.loads(json.dumps(line)) for line in lines]
+    assert canonical(reassemble(lines, query)) == canonical(resources)
+
+
+def test_no_child_lines_without_associated(list_functions):
+    query = ResourceQuery.from_args({"fields": "name,type"})
+    source = PagedNamespaceSource("ns", None, page_size=4)
+
+    async def stream():
+        return [line async for line in k8s_resource_api.iter_streamed_resources(source, query)]
+
+    assert not any("parent" in line for line in asyncio.run(stream()))
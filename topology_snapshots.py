@@ -0,0 +1,73 @@
+# topology_snapshots.py
+
+import asyncio
+import json
+import os
+import re
+import time
+from config import Config
+
+
+class SnapshotStore:
+    """
+    Last computed /api/environment-resources topology per environment,
+    persisted as one JSON file each with the informer version token it was
+    built from. Lets a freshly started app answer before its informers sync.
+    """
+
+    def __init__(self, directory=None, interval_seconds=None):
+        self.directory = directory or Config.TOPOLOGY_SNAPSHOT_DIR
+        self.interval_seconds = Config.TOPOLOGY_SNAPSHOT_INTERVAL_SECONDS if interval_seconds is None else interval_seconds
+        self._saved = {}  # env_name -> (version token, monotonic save time)
+
+    def _path(self, env_name):
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", env_name)
+        return os.path.join(self.directory, f"{safe}.json")
+
+    async def load(self, env_name):
+        """The stored snapshot dict, or None when there is none or it is unreadable."""
+        try:
+            return await asyncio.to_thread(self._read, env_name)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"[Snapshots] Ignoring unreadable snapshot for '{env_name}': {e}")
+            return None
+
+    def due(self, env_name, version):
+        """True when `version` is new and the last save is older than the persist interval."""
+        saved = self._saved.get(env_name)
+        if saved is None:
+            return True
+        token, saved_at = saved
+        return token != version and time.monotonic() - saved_at >= self.interval_seconds
+
+    async def save(self, env_name, version, resources):
+        self._saved[env_name] = (version, time.monotonic())
+        try:
+            await asyncio.to_thread(self._write, env_name, version, resources)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"[Snapshots] Failed to persist snapshot for '{env_name}': {e}")
+
+    async def delete(self, env_name):
+        """Forgets an environment's snapshot, on disk and in memory."""
+        self._saved.pop(env_name, None)
+        try:
+            await asyncio.to_thread(os.remove, self._path(env_name))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[Snapshots] Failed to remove snapshot for '{env_name}': {e}")
+
+    def _read(self, env_name):
+        with open(self._path(env_name)) as f:
+            return json.load(f)
+
+    def _write(self, env_name, version, resources):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(env_name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": version, "saved_at": time.time(), "resources": resources}, f)
+        # Atomic swap, so a crash mid-write never leaves a torn snapshot behind
+        os.replace(tmp_path, path)